@@ -0,0 +1,199 @@
+import numpy as np
+from scipy.linalg import get_lapack_funcs
+from pricing import _as_arrays, _unwrap
+
+_VOL_BUMP = 0.01
+_RATE_BUMP = 0.0001
+
+# Function to broadcast lattice inputs to flat contract vectors and check the lattice is well defined
+def _contracts(S, K, T, r, sigma):
+    S, K, T, r, sigma = _as_arrays(S, K, T, r, sigma)
+    shape = S.shape
+    S, K, T, r, sigma = (np.ravel(x) for x in (S, K, T, r, sigma))
+    if np.any(T <= 0) or np.any(sigma <= 0):
+        raise ValueError("Lattice and PDE pricers need T > 0 and sigma > 0; use black_scholes for expired or zero-volatility contracts")
+    return shape, S, K, T, r, sigma
+
+# Function to stack base, sigma-bumped and rate-bumped copies of the contracts so vega and rho come
+# out of the same vectorized backward induction as the price
+def _bumped(S, K, T, r, sigma):
+    sigmas = [sigma, sigma + _VOL_BUMP, sigma - np.minimum(_VOL_BUMP, 0.5 * sigma), sigma, sigma]
+    rates = [r, r, r, r + _RATE_BUMP, r - _RATE_BUMP]
+    return (np.tile(S, 5), np.tile(K, 5), np.tile(T, 5), np.concatenate(rates), np.concatenate(sigmas))
+
+# Function to assemble the result dictionary, with vega and rho from the bumped copies
+def _result(shape, n, price, delta, gamma, theta, sigma, boundary, times):
+    base, vol_up, vol_down, rate_up, rate_down = (price[i * n:(i + 1) * n] for i in range(5))
+    vol_step = _VOL_BUMP + np.minimum(_VOL_BUMP, 0.5 * sigma)
+    result = {
+        'price': base,
+        'delta': delta[:n],
+        'gamma': gamma[:n],
+        'theta': theta[:n],
+        'vega': (vol_up - vol_down) / vol_step,
+        'rho': (rate_up - rate_down) / (2 * _RATE_BUMP),
+    }
+    result = {name: _unwrap(value.reshape(shape)) for name, value in result.items()}
+    result['boundary'] = boundary[:n].reshape(shape + boundary.shape[1:])
+    result['boundary_times'] = times[:n].reshape(shape + times.shape[1:])
+    return result
+
+# Function to record the early-exercise boundary at one time level: the highest exercised stock
+# price for puts, the lowest for calls, NaN where no node is exercised
+def _boundary(stock, exercised, is_call):
+    if is_call:
+        level = np.where(exercised, stock, np.inf).min(axis=1)
+    else:
+        level = np.where(exercised, stock, -np.inf).max(axis=1)
+    return np.where(np.isfinite(level), level, np.nan)
+
+# Function to run backward induction on a binomial (CRR) or trinomial (Boyle) lattice for a vector of
+# contracts. Each time step updates every node of every contract in one NumPy expression.
+def _lattice(S, K, T, r, sigma, option, american, steps, trinomial):
+    sign = 1.0 if option == 'call' else -1.0
+    dt = (T / steps)[:, None]
+    r_, sigma_, S_, K_ = r[:, None], sigma[:, None], S[:, None], K[:, None]
+    disc = np.exp(-r_ * dt)
+    if trinomial:
+        a, g = np.exp(sigma_ * np.sqrt(dt / 2)), np.exp(r_ * dt / 2)
+        p_up = ((g - 1 / a) / (a - 1 / a)) ** 2
+        p_down = ((a - g) / (a - 1 / a)) ** 2
+        probs = (p_up, 1 - p_up - p_down, p_down)
+        log_u = sigma_ * np.sqrt(2 * dt)
+        exponents = lambda i: i - np.arange(2 * i + 1)
+        greek_level = 1
+    else:
+        log_u = sigma_ * np.sqrt(dt)
+        u = np.exp(log_u)
+        p = (np.exp(r_ * dt) - 1 / u) / (u - 1 / u)
+        probs = (p, 1 - p)
+        exponents = lambda i: i - 2 * np.arange(i + 1)
+        greek_level = 2
+    if np.any((probs[0] < 0) | (probs[-1] < 0) | (probs[0] > 1)):
+        raise ValueError("Lattice probabilities out of range; increase steps")
+
+    # Node prices one step earlier are the leading nodes of the later step divided by u
+    nodes = S_ * np.exp(log_u * exponents(steps))
+    down = np.exp(-log_u)
+    values = np.maximum(sign * (nodes - K_), 0.0)
+    boundary = np.full((S.size, steps), np.nan)
+    for i in range(steps - 1, -1, -1):
+        width = values.shape[1] - len(probs) + 1
+        values = disc * sum(prob * values[:, k:k + width] for k, prob in enumerate(probs))
+        nodes = nodes[:, :width] * down
+        if american:
+            exercise = np.maximum(sign * (nodes - K_), 0.0)
+            boundary[:, i] = _boundary(nodes, (exercise > values) & (exercise > 0), option == 'call')
+            values = np.maximum(values, exercise)
+        if i == greek_level:
+            level_values, level_stock = values, nodes
+
+    price = values[:, 0]
+    delta = (level_values[:, 0] - level_values[:, 2]) / (level_stock[:, 0] - level_stock[:, 2])
+    upper = (level_values[:, 0] - level_values[:, 1]) / (level_stock[:, 0] - level_stock[:, 1])
+    lower = (level_values[:, 1] - level_values[:, 2]) / (level_stock[:, 1] - level_stock[:, 2])
+    gamma = (upper - lower) / (0.5 * (level_stock[:, 0] - level_stock[:, 2]))
+    theta = (level_values[:, 1] - price) / (greek_level * dt[:, 0])
+    times = dt * np.arange(steps)
+    return price, delta, gamma, theta, boundary, times
+
+# Function to price American (or European) options on a binomial CRR lattice, vectorized across
+# contracts. Returns price, delta, gamma, theta (per year), vega, rho and the early-exercise boundary
+# (critical stock price per time step, NaN where exercise is never optimal) with its times.
+def binomial_price(S, K, T, r, sigma, option='put', american=True, steps=500):
+    if steps < 3:
+        raise ValueError("binomial_price needs steps >= 3 to read delta, gamma and theta off the lattice")
+    shape, S, K, T, r, sigma = _contracts(S, K, T, r, sigma)
+    price, delta, gamma, theta, boundary, times = _lattice(*_bumped(S, K, T, r, sigma), option, american, steps, False)
+    return _result(shape, S.size, price, delta, gamma, theta, sigma, boundary, times)
+
+# Function to price American (or European) options on a trinomial lattice; same outputs as binomial_price
+def trinomial_price(S, K, T, r, sigma, option='put', american=True, steps=300):
+    if steps < 2:
+        raise ValueError("trinomial_price needs steps >= 2 to read delta, gamma and theta off the lattice")
+    shape, S, K, T, r, sigma = _contracts(S, K, T, r, sigma)
+    price, delta, gamma, theta, boundary, times = _lattice(*_bumped(S, K, T, r, sigma), option, american, steps, True)
+    return _result(shape, S.size, price, delta, gamma, theta, sigma, boundary, times)
+
+# Function to solve the Black-Scholes PDE with Crank-Nicolson on a uniform stock grid per contract.
+# All contracts are stacked into one block-diagonal tridiagonal system that LAPACK factorizes once,
+# so each time step is a single banded solve across every contract. The first step is replaced by two implicit
+# half steps (Rannacher smoothing) to damp oscillations from the payoff kink, and American
+# exercise is applied by projecting onto the payoff after each step.
+def _crank_nicolson(S, K, T, r, sigma, S_max, option, american, grid_points, time_steps):
+    n, M = S.size, grid_points
+    sign = 1.0 if option == 'call' else -1.0
+    dt = T / time_steps
+    dS = S_max / M
+    j = np.arange(M + 1, dtype=float)[None, :]
+    s2j2 = (sigma[:, None] * j) ** 2
+    rj = r[:, None] * j
+    half_dt = 0.5 * dt[:, None]
+    sub = half_dt * 0.5 * (s2j2 - rj)
+    diag = -half_dt * (s2j2 + r[:, None])
+    sup = half_dt * 0.5 * (s2j2 + rj)
+    # Boundary rows are identity rows; their values are reset from the boundary conditions after each solve
+    for coeff in (sub, diag, sup):
+        coeff[:, [0, M]] = 0.0
+    gttrf, gttrs = get_lapack_funcs(('gttrf', 'gttrs'), dtype=np.float64)
+    factors = gttrf(-sub.ravel()[1:], 1 - diag.ravel(), -sup.ravel()[:-1])[:5]
+    solve = lambda rhs: gttrs(*factors, rhs.ravel())[0].reshape(n, M + 1)
+
+    # Explicit half of the Crank-Nicolson step, applied row-wise without coupling contracts
+    def explicit(v):
+        out = (1 + diag) * v
+        out[:, 1:] += sub[:, 1:] * v[:, :-1]
+        out[:, :-1] += sup[:, :-1] * v[:, 1:]
+        return out
+
+    grid = dS[:, None] * j
+    payoff = np.maximum(sign * (grid - K[:, None]), 0.0)
+    values = payoff.copy()
+    boundary = np.full((n, time_steps), np.nan)
+
+    for step in range(1, time_steps + 1):
+        tau = step * dt
+        if step == 1:
+            values = solve(solve(values))
+        else:
+            values = solve(explicit(values))
+        growth = K if american else K * np.exp(-r * tau)
+        if option == 'call':
+            values[:, 0], values[:, M] = 0.0, S_max - K * np.exp(-r * tau)
+        else:
+            values[:, 0], values[:, M] = growth, 0.0
+        if american:
+            exercised = (payoff > values) & (payoff > 0)
+            boundary[:, time_steps - step] = _boundary(grid, exercised, option == 'call')
+            values = np.maximum(values, payoff)
+        if step == time_steps - 1:
+            previous = values.copy()
+
+    # Quadratic interpolation through the three nodes around the spot gives price, delta and gamma
+    x = S / dS
+    centre = np.clip(np.rint(x).astype(int), 1, M - 1)
+    rows = np.arange(n)
+    v_lo, v_mid, v_hi = (values[rows, centre + k] for k in (-1, 0, 1))
+    p_lo, p_mid, p_hi = (previous[rows, centre + k] for k in (-1, 0, 1))
+    h = x - centre
+    first, second = 0.5 * (v_hi - v_lo), v_hi - 2 * v_mid + v_lo
+    price = v_mid + h * first + 0.5 * h * h * second
+    delta = (first + h * second) / dS
+    gamma = second / dS ** 2
+    previous_price = p_mid + h * 0.5 * (p_hi - p_lo) + 0.5 * h * h * (p_hi - 2 * p_mid + p_lo)
+    theta = (previous_price - price) / dt
+    times = dt[:, None] * np.arange(time_steps)
+    return price, delta, gamma, theta, boundary, times
+
+# Function to price American (or European) options with a Crank-Nicolson finite-difference solver,
+# vectorized across contracts; same outputs as binomial_price
+def crank_nicolson_price(S, K, T, r, sigma, option='put', american=True, grid_points=400, time_steps=200):
+    if time_steps < 2:
+        raise ValueError("crank_nicolson_price needs time_steps >= 2 (theta is taken from the last two steps)")
+    if grid_points < 3:
+        raise ValueError("crank_nicolson_price needs grid_points >= 3")
+    shape, S, K, T, r, sigma = _contracts(S, K, T, r, sigma)
+    S_max = np.maximum(S, K) * np.maximum(3.0, np.exp(5 * sigma * np.sqrt(T)))
+    bumped = _bumped(S, K, T, r, sigma)
+    price, delta, gamma, theta, boundary, times = _crank_nicolson(*bumped, np.tile(S_max, 5), option, american, grid_points, time_steps)
+    return _result(shape, S.size, price, delta, gamma, theta, sigma, boundary, times)
@@ -0,0 +1,149 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from market_data import fetch_bulk_history
+from utils import prepare_trading_data
+
+FEATURES = ['Return', 'MA10', 'MA50', 'RSI']
+_PANEL_COLUMNS = FEATURES + ['Signal']
+
+# Function to predict the trading signal out of sample by refitting on expanding or rolling windows.
+# Rows before the first test window are NaN; each test block is predicted by a model trained only
+# on the rows before it.
+def walk_forward_signals(X, y, train_size=252, test_size=63, window='expanding', n_estimators=100, random_state=0, n_jobs=1):
+    predicted = np.full(len(y), np.nan)
+    for start in range(train_size, len(y), test_size):
+        first = 0 if window == 'expanding' else start - train_size
+        model = RandomForestClassifier(n_estimators=n_estimators, random_state=random_state, n_jobs=n_jobs)
+        model.fit(X[first:start], y[first:start])
+        predicted[start:start + test_size] = model.predict(X[start:start + test_size])
+    return predicted
+
+# Function to compute long/flat strategy metrics from predicted signals: the signal at the close of
+# day t holds the position over day t+1's return
+def backtest_metrics(predicted, returns):
+    position = np.nan_to_num(predicted[:-1])
+    traded = ~np.isnan(predicted[:-1])
+    pnl = position * returns[1:]
+    pnl = pnl[traded]
+    equity = np.cumprod(1 + pnl)
+    in_market = position[traded] > 0
+    std = pnl.std()
+    return {
+        'total_return': equity[-1] - 1 if equity.size else 0.0,
+        'hit_rate': (returns[1:][traded][in_market] > 0).mean() if in_market.any() else np.nan,
+        'max_drawdown': (1 - equity / np.maximum.accumulate(equity)).max() if equity.size else 0.0,
+        'sharpe': pnl.mean() / std * np.sqrt(252) if std > 0 else np.nan,
+        'exposure': in_market.mean() if in_market.size else 0.0,
+        'days': int(traded.sum()),
+    }
+
+# Function to run a walk-forward backtest for one ticker's prepared trading data
+def walk_forward(data, train_size=252, test_size=63, window='expanding', n_estimators=100, n_jobs=-1):
+    X = data[FEATURES].to_numpy()
+    y = data['Signal'].to_numpy()
+    predicted = walk_forward_signals(X, y, train_size, test_size, window, n_estimators, n_jobs=n_jobs)
+    data = data.copy()
+    data['Signal_Predicted'] = predicted
+    return data, backtest_metrics(predicted, data['Return'].to_numpy())
+
+# Worker: attach to the shared price panel, slice one ticker's rows and backtest one window scheme
+def _run_task(shm_name, shape, ticker, start, stop, window, train_size, test_size, n_estimators):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        panel = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        rows = panel[start:stop]
+        predicted = walk_forward_signals(rows[:, :4], rows[:, 4].astype(int), train_size, test_size, window, n_estimators)
+        metrics = backtest_metrics(predicted, rows[:, 0])
+    finally:
+        shm.close()
+    return dict(ticker=ticker, window=window, **metrics)
+
+# Function to backtest a universe of tickers across window schemes on a process pool. The prepared
+# data for all tickers is packed once into a shared-memory panel that workers read without pickling
+# DataFrames; results are yielded as each worker finishes. Tickers that cannot be backtested are
+# recorded with the reason in `skipped` (ticker -> message) when a dict is passed.
+def run_universe(tickers, windows=('expanding', 'rolling'), train_size=252, test_size=63, n_estimators=100, max_workers=None, skipped=None):
+    skipped = {} if skipped is None else skipped
+    _, errors = fetch_bulk_history(tickers, period="5y")
+    skipped.update(errors)
+    frames = {}
+    for ticker in tickers:
+        if ticker in errors:
+            continue
+        try:
+            data = prepare_trading_data(ticker)
+        except Exception as e:
+            skipped[ticker] = f"Could not prepare trading data: {e}"
+            continue
+        if len(data) > train_size:
+            frames[ticker] = data[_PANEL_COLUMNS].to_numpy(dtype=np.float64)
+        else:
+            skipped[ticker] = f"Only {len(data)} prepared rows, need more than train_size={train_size}"
+    if not frames:
+        return
+
+    total = sum(len(rows) for rows in frames.values())
+    shape = (total, len(_PANEL_COLUMNS))
+    shm = shared_memory.SharedMemory(create=True, size=total * len(_PANEL_COLUMNS) * 8)
+    try:
+        panel = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        offsets, start = {}, 0
+        for ticker, rows in frames.items():
+            panel[start:start + len(rows)] = rows
+            offsets[ticker] = (start, start + len(rows))
+            start += len(rows)
+        del frames
+
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            futures = [
+                executor.submit(_run_task, shm.name, shape, ticker, lo, hi, window, train_size, test_size, n_estimators)
+                for ticker, (lo, hi) in offsets.items() for window in windows
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+        del panel
+    finally:
+        shm.close()
+        shm.unlink()
+
+# Function to collect backtest results into a summary table, one row per ticker and window scheme
+def summary_table(results):
+    table = pd.DataFrame(list(results))
+    return table.set_index(['ticker', 'window']).sort_index() if not table.empty else table
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the trading signal model")
+    parser.add_argument("tickers", nargs="+", help="Tickers, or @file with one ticker per line")
+    parser.add_argument("--train-size", type=int, default=252)
+    parser.add_argument("--test-size", type=int, default=63)
+    parser.add_argument("--windows", default="expanding,rolling")
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", help="Write the summary table to this CSV file")
+    args = parser.parse_args()
+
+    tickers = []
+    for item in args.tickers:
+        if item.startswith("@"):
+            with open(item[1:]) as f:
+                tickers.extend(line.strip().upper() for line in f if line.strip())
+        else:
+            tickers.append(item.upper())
+
+    results, skipped = [], {}
+    for result in run_universe(tickers, args.windows.split(","), args.train_size, args.test_size, args.n_estimators, args.workers, skipped):
+        results.append(result)
+        print(f"{result['ticker']:<8} {result['window']:<10} return {result['total_return']:+.2%}  "
+              f"hit {result['hit_rate']:.2%}  drawdown {result['max_drawdown']:.2%}", flush=True)
+    for ticker, reason in skipped.items():
+        print(f"{ticker:<8} skipped: {reason}", flush=True)
+    table = summary_table(results)
+    print(table.to_string())
+    if args.output:
+        table.to_csv(args.output)
@@ -0,0 +1,246 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+
+import data_cache
+import funcs
+import utils
+from indicators import IndicatorEngine
+from page_loader import PAGES
+from portfolio import PortfolioRisk
+from volatility import ESTIMATORS, FIELDS
+from pricing import black_scholes_greeks, implied_volatility
+
+# Function to time fn (best of repeat runs) and measure its peak traced memory in a separate run
+def _measure(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+# Function to build deterministic random contracts
+def _contracts(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(50, 150, n), rng.uniform(40, 160, n), rng.uniform(0.02, 2, n),
+            rng.uniform(0, 0.06, n), rng.uniform(0.05, 1.0, n))
+
+# Benchmark: one contract at a time through the scalar APIs, as the Streamlit pages call them
+def bench_scalar_pricing(n=1000):
+    S, K, T, r, sigma = (x.tolist() for x in _contracts(n))
+    cases = {}
+    for name, fn in (('funcs.black_scholes', funcs.black_scholes), ('utils.black_scholes', utils.black_scholes)):
+        cases[f"scalar/{name}"] = (lambda fn=fn: [fn(*args) for args in zip(S, K, T, r, sigma)], n, 'contracts')
+    return cases
+
+# Benchmark: whole arrays of contracts through the vectorized kernels
+def bench_batch_pricing(sizes):
+    cases = {}
+    for n in sizes:
+        args = _contracts(n)
+        cases[f"batch/black_scholes/{n}"] = (lambda args=args: utils.black_scholes(*args), n, 'contracts')
+        cases[f"batch/black_scholes_float32/{n}"] = (lambda args=args: utils.black_scholes(*args, dtype=np.float32), n, 'contracts')
+        cases[f"batch/greeks/{n}"] = (lambda args=args: black_scholes_greeks(*args), n, 'contracts')
+    n = min(max(sizes), 100_000)
+    S, K, T, r, sigma = _contracts(n)
+    is_call = np.arange(n) % 2 == 0
+    call, put = utils.black_scholes(S, K, T, r, sigma)
+    price = np.where(is_call, call, put)
+    cases[f"batch/implied_volatility/{n}"] = (lambda: implied_volatility(price, S, K, T, r, is_call), n, 'quotes')
+    return cases
+
+# Benchmark: per-ticker data preparation from a warm synthetic cache, plus the bulk indicator engine
+def bench_data_prep(ticker_counts):
+    cases = {}
+    for n in ticker_counts:
+        tickers = [f"SYN{i}" for i in range(n)]
+        for ticker in tickers:
+            data_cache.get_cache().get_history(ticker, period="5y")
+        for name, fn in (('calculate_volatility', utils.calculate_volatility),
+                         ('prepare_stock_data', utils.prepare_stock_data),
+                         ('prepare_trading_data', utils.prepare_trading_data)):
+            cases[f"prep/{name}/{n}"] = (lambda fn=fn, tickers=tickers: [fn(t) for t in tickers], n, 'tickers')
+        closes = np.column_stack([data_cache.get_cache().get_history(t, period="5y")['Close'].to_numpy() for t in tickers])
+        cases[f"prep/indicator_bootstrap/{n}"] = (lambda tickers=tickers, closes=closes: IndicatorEngine(tickers).bootstrap(closes), n, 'tickers')
+        engine = IndicatorEngine(tickers)
+        engine.bootstrap(closes)
+        cases[f"prep/indicator_update/{n}"] = (lambda engine=engine, bar=closes[-1]: engine.update(bar), n, 'tickers')
+        ohlc = [np.column_stack([data_cache.get_cache().get_history(t, period="1y")[field].to_numpy() for t in tickers]) for field in FIELDS]
+        for name, estimator in ESTIMATORS.items():
+            cases[f"prep/volatility_{name}/{n}"] = (lambda estimator=estimator, ohlc=ohlc: estimator(*ohlc), n, 'tickers')
+    return cases
+
+# Benchmark: model fit and predict times on the prediction page feature sets
+def bench_models():
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LinearRegression
+
+    stock = utils.prepare_stock_data("SYN0")
+    trading = utils.prepare_trading_data("SYN0")
+    X_stock, y_stock = stock[['Lag1', 'Lag2']], stock['Return']
+    X_trade, y_trade = trading[['Return', 'MA10', 'MA50', 'RSI']], trading['Signal']
+    linear = LinearRegression().fit(X_stock, y_stock)
+    forest = RandomForestClassifier(n_jobs=-1, random_state=0).fit(X_trade, y_trade)
+    return {
+        "model/linear_fit": (lambda: LinearRegression().fit(X_stock, y_stock), len(X_stock), 'rows'),
+        "model/linear_predict": (lambda: linear.predict(X_stock), len(X_stock), 'rows'),
+        "model/random_forest_fit": (lambda: RandomForestClassifier(n_jobs=-1, random_state=0).fit(X_trade, y_trade), len(X_trade), 'rows'),
+        "model/random_forest_predict": (lambda: forest.predict(X_trade), len(X_trade), 'rows'),
+    }
+
+# Benchmark: portfolio Greeks and VaR for option books across hundreds of underlyings, and the
+# incremental update of a single position
+def bench_portfolio(position_counts, n_underlyings=200, n_days=252):
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    tickers = [f"SYN{i}" for i in range(n_underlyings)]
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_days, n_underlyings)), axis=0))
+    panel = pd.DataFrame(closes, columns=tickers)
+    cases = {}
+    for n in position_counts:
+        positions = pd.DataFrame({
+            'ticker': rng.choice(tickers, n),
+            'type': rng.choice(['call', 'put', 'stock'], n),
+            'quantity': rng.integers(-10, 11, n),
+            'K': rng.uniform(60, 140, n),
+            'T': rng.uniform(0.05, 2, n),
+            'r': 0.04,
+        })
+        def full(positions=positions):
+            risk = PortfolioRisk(positions, panel)
+            return risk.greeks(), risk.parametric_var(), risk.historical_var()
+        cases[f"portfolio/greeks_var/{n}"] = (full, n, 'positions')
+        risk = PortfolioRisk(positions, panel)
+        cases[f"portfolio/update_position/{n}"] = (lambda risk=risk: risk.update_position(0, quantity=5), 1, 'updates')
+    return cases
+
+_CACHE_BYTES_PER_TICKER = 1024 ** 2
+
+_IMPORT_SCRIPT = (
+    "import resource, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+)
+
+# Benchmark: cold import time of each page module (and everything it pulls in) in a fresh
+# interpreter, i.e. what a new session pays before the page can draw. Modules whose dependencies
+# are not installed are skipped.
+def bench_startup(repeat=3):
+    results = {}
+    root = os.path.dirname(os.path.abspath(__file__))
+    for module in ['utils'] + [module for module, _ in PAGES.values()]:
+        best = peak = None
+        for _ in range(repeat):
+            proc = subprocess.run([sys.executable, '-c', _IMPORT_SCRIPT.format(module=module)], cwd=root, capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"startup/import/{module}: skipped ({proc.stderr.strip().splitlines()[-1]})", flush=True)
+                break
+            seconds, max_rss = proc.stdout.split()[-2:]
+            best = min(best or float('inf'), float(seconds))
+            peak = max(peak or 0.0, int(max_rss) / 1024)
+        else:
+            results[f"startup/import/{module}"] = {'seconds': best, 'throughput': 1 / best, 'unit': 'imports/s', 'peak_mb': peak}
+    return results
+
+def _print_result(name, result):
+    print(f"{name:<45} {result['seconds'] * 1e3:>10.2f} ms  {result['throughput']:>14,.0f} {result['unit']}  {result['peak_mb']:>8.1f} MB", flush=True)
+
+# Function to run every benchmark case and collect throughput and peak memory
+def run(quick=False, repeat=3, startup_only=False):
+    results = bench_startup(repeat)
+    for name, result in results.items():
+        _print_result(name, result)
+    if startup_only:
+        return {'meta': _meta(quick), 'results': results}
+
+    sizes = [1, 1_000, 100_000] if quick else [1, 1_000, 100_000, 1_000_000, 10_000_000]
+    ticker_counts = [1, 100] if quick else [1, 100, 1_000, 10_000]
+    # The store must hold every warmed 5y history (about 72 KB each) so the prep cases stay cache-warm
+    cache_dir = tempfile.TemporaryDirectory(prefix='bsm-bench-')
+    data_cache.set_cache(data_cache.OHLCVCache(cache_dir.name, data_cache.SyntheticProvider(seed=0),
+                                               max_bytes=max(ticker_counts) * _CACHE_BYTES_PER_TICKER))
+    try:
+        results.update(_run_cases(sizes, ticker_counts, quick, repeat))
+    finally:
+        data_cache.set_cache(None)
+        cache_dir.cleanup()
+    return {'meta': _meta(quick), 'results': results}
+
+def _run_cases(sizes, ticker_counts, quick, repeat):
+    cases = {}
+    cases.update(bench_scalar_pricing())
+    cases.update(bench_batch_pricing(sizes))
+    cases.update(bench_data_prep(ticker_counts))
+    cases.update(bench_models())
+    cases.update(bench_portfolio([1_000] if quick else [1_000, 10_000, 100_000]))
+
+    results = {}
+    for name, (fn, items, unit) in cases.items():
+        seconds, peak = _measure(fn, repeat=1 if items >= 1_000_000 or (name.startswith('prep/') and items >= 1_000) else repeat)
+        results[name] = {
+            'seconds': seconds,
+            'throughput': items / seconds if seconds > 0 else float('inf'),
+            'unit': f"{unit}/s",
+            'peak_mb': peak / 1024 ** 2,
+        }
+        _print_result(name, results[name])
+    return results
+
+def _meta(quick):
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'quick': quick,
+    }
+
+# Function to compare a run against a stored baseline; returns the cases slower than the threshold
+def compare(report, baseline, threshold=0.25):
+    regressions = []
+    for name, result in report['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        ratio = result['seconds'] / base['seconds'] if base['seconds'] > 0 else 1.0
+        if ratio > 1 + threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark pricing, data-prep and model-fit hot paths on synthetic data")
+    parser.add_argument("--quick", action="store_true", help="Use smaller problem sizes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--startup-only", action="store_true", help="Only measure page import (cold start) times")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write this run's results")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before a case counts as a regression")
+    args = parser.parse_args()
+
+    report = run(quick=args.quick, repeat=args.repeat, startup_only=args.startup_only)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for name, ratio in regressions:
+            print(f"REGRESSION {name}: {ratio:.2f}x slower than baseline")
+        sys.exit(1 if regressions else 0)
@@ -1,8 +1,104 @@
 import streamlit as st
 from utils import fetch_stock_data, calculate_volatility, fetch_historical_data, black_scholes, fetch_risk_free_rate
+from monte_carlo import monte_carlo_price, PAYOFFS, BARRIER_TYPES
+from market_data import fetch_bulk_history, summarize_history
 from datetime import datetime, timedelta, date
+import numpy as np
+import pandas as pd
+from instrumentation import stage
+from downsample import DEFAULT_WIDTH, downsample_frame
+from volatility import ESTIMATORS
+from live import ReplayFeed, LiveRepricer
+from yield_curve import get_yield_curve
 import plotly.express as px
 
+# Function to price calls and puts over a spot x volatility (or spot x time) grid in one vectorized
+# black_scholes call; memoized on its inputs so only a changed input reprices the grid
+@st.cache_data(max_entries=64)
+def sensitivity_grid(S, K, T, r, sigma, axis="Volatility", size=200, spot_range=0.3):
+    spots = np.linspace(S * (1 - spot_range), S * (1 + spot_range), size)
+    if axis == "Volatility":
+        ys = np.linspace(max(sigma * 0.5, 0.01), max(sigma * 1.5, 0.02), size)
+        call, put = black_scholes(spots[None, :], K, T, r, ys[:, None], dtype=np.float32)
+    else:
+        ys = np.linspace(T, 0.0, size)
+        call, put = black_scholes(spots[None, :], K, ys[:, None], r, sigma, dtype=np.float32)
+    return spots, ys, call, put
+
+# Function to return a ticker's close history reduced to about width points for plotting; cached
+# per ticker, period and width (an already loaded history can be passed as _history)
+@st.cache_data(max_entries=256, ttl=900)
+def chart_history(ticker, period, width=DEFAULT_WIDTH, _history=None):
+    history = fetch_historical_data(ticker, period=period) if _history is None else _history
+    return downsample_frame(history[['Close']], 'Close', width)
+
+ESTIMATOR_LABELS = {
+    'close_to_close': "Close-to-Close",
+    'ewma': "EWMA (RiskMetrics)",
+    'parkinson': "Parkinson",
+    'garman_klass': "Garman-Klass",
+    'yang_zhang': "Yang-Zhang",
+    'garch': "GARCH(1,1)",
+}
+
+# Function to return a ticker's annualized volatility under one estimator; cached so switching
+# estimators reuses both the stored history and earlier estimates
+@st.cache_data(max_entries=256, ttl=900)
+def estimated_volatility(ticker, estimator):
+    return calculate_volatility(ticker, estimator)
+
+LIVE_REFRESH_SECONDS = 0.5
+LIVE_MONEYNESS = (0.9, 0.95, 1.0, 1.05, 1.1)
+
+# Function to drain the live feed, reprice the contracts whose underlying moved and redraw the table;
+# Streamlit reruns only this fragment every LIVE_REFRESH_SECONDS
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def live_section():
+    live = st.session_state.get('live')
+    if live is None or 'feed' not in live:
+        return
+    feed, repricer = live['feed'], live['repricer']
+    with stage("live reprice"):
+        repricer.apply(feed.drain())
+    metrics = repricer.metrics()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Feed Lag (mean)", f"{metrics['lag_ms_mean']:.0f} ms")
+    col2.metric("Feed Lag (max)", f"{metrics['lag_ms_max']:.0f} ms")
+    col3.metric("Reprices / s", f"{metrics['reprices_per_second']:,.0f}")
+    col4.metric("Ticks Coalesced", f"{feed.stats['coalesced']:,}")
+    st.dataframe(repricer.frame().round(4), hide_index=True, use_container_width=True)
+
+# Function to start (or restart, when its inputs change) the session's replay feed and repricer.
+# Spots come from the feed's own bulk-fetched history; tickers without data are left out and kept
+# in the session state's 'errors', and 'error' is set when no ticker has data at all.
+def start_live(tickers, T, r, estimator, threshold):
+    key = (tuple(tickers), T, r, estimator)
+    live = st.session_state.get('live')
+    if live is not None and live['key'] == key:
+        if 'feed' in live:
+            live['repricer'].threshold = threshold
+            # The feed stops itself when idle, e.g. after the tab was in the background
+            live['feed'].start()
+        return live
+    stop_live()
+    try:
+        feed = ReplayFeed.from_history(tickers)
+    except LookupError as e:
+        st.session_state.live = {'key': key, 'error': str(e), 'errors': {}}
+        return st.session_state.live
+    spots = feed.closes.iloc[-1]
+    contracts = pd.DataFrame(
+        [(ticker, round(spots[ticker] * m, 2), T, r, estimated_volatility(ticker, estimator)) for ticker in feed.tickers for m in LIVE_MONEYNESS],
+        columns=['ticker', 'K', 'T', 'r', 'sigma'])
+    st.session_state.live = {'key': key, 'feed': feed.start(), 'repricer': LiveRepricer(contracts, spots, threshold), 'errors': feed.errors}
+    return st.session_state.live
+
+# Function to stop the session's replay feed, if one is running
+def stop_live():
+    live = st.session_state.pop('live', None)
+    if live is not None and 'feed' in live:
+        live['feed'].stop()
+
 def display_black_scholes_model():
     st.title("Real-Time Black-Scholes Options Pricing Model")
 
@@ -21,8 +117,13 @@ def display_black_scholes_model():
     st.sidebar.write(f"Days to Expiration: {(expiration_date - date.today()).days} days")
 
     # Fetch real-time risk-free rate and volatility
-    r = fetch_risk_free_rate()
-    sigma = calculate_volatility(ticker)
+    r = fetch_risk_free_rate(T)
+    curve = get_yield_curve()
+    if curve.error is not None:
+        in_use = "the last loaded curve" if curve.loaded else f"a flat {curve.fallback_rate:.2%} fallback rate"
+        st.sidebar.warning(f"Yield curve could not be loaded ({curve.error}); using {in_use}.")
+    estimator = st.sidebar.selectbox("Volatility Estimator", list(ESTIMATORS), format_func=ESTIMATOR_LABELS.get)
+    sigma = estimated_volatility(ticker, estimator)
 
     default_strike_price = S * 1.05  # Default strike price set to 5% above current stock price
     K = st.sidebar.slider("Strike Price", min_value=1.0, max_value=2*S, value=default_strike_price)
@@ -33,10 +134,11 @@ def display_black_scholes_model():
         sigma = float(volatility_input) / 100
     except ValueError:
         st.sidebar.error("Please enter a valid volatility percentage.")
-        sigma = calculate_volatility(ticker)
+        sigma = estimated_volatility(ticker, estimator)
 
     # Calculate option prices
-    call_price, put_price = black_scholes(S, K, T, r, sigma)
+    with stage("price black_scholes"):
+        call_price, put_price = black_scholes(S, K, T, r, sigma)
 
     # Multiselect for stocks (single selection only)
     stocks = ["AAPL"]
@@ -47,8 +149,9 @@ def display_black_scholes_model():
 
     # Fetch data for the selected stock
     S = fetch_stock_data(selected_stock)
-    sigma = calculate_volatility(selected_stock)
-    call_price, put_price = black_scholes(S, K, T, r, sigma)
+    sigma = estimated_volatility(selected_stock, estimator)
+    with stage("price black_scholes"):
+        call_price, put_price = black_scholes(S, K, T, r, sigma)
 
     # Display results in two columns
     st.subheader(f"Stock: {selected_stock}")
@@ -68,35 +171,91 @@ def display_black_scholes_model():
         else:
             st.markdown(f"<div style='font-size:24px'><b>Recommendation:</b> Buying a Put option may be more favorable.</div>", unsafe_allow_html=True)
 
+    # Sensitivity heatmaps over a grid of spot prices
+    st.header("Price Sensitivity")
+    col1, col2, col3 = st.columns(3)
+    axis = col1.radio("Grid", ["Volatility", "Time to Expiration"], horizontal=True)
+    option = col2.radio("Option", ["Call", "Put"], horizontal=True)
+    measure = col3.radio("Show", ["Value", "P&L"], horizontal=True)
+    with stage("price sensitivity grid"):
+        spots, ys, call_grid, put_grid = sensitivity_grid(float(S), float(K), float(T), float(r), float(sigma), axis)
+    grid = call_grid if option == "Call" else put_grid
+    if measure == "P&L":
+        grid = grid - (call_price if option == "Call" else put_price)
+    y_label = "Volatility" if axis == "Volatility" else "Time to Expiration (years)"
+    with stage("chart sensitivity heatmap"):
+        fig = px.imshow(grid, x=spots, y=ys, origin="lower", aspect="auto", color_continuous_scale="RdYlGn",
+                        color_continuous_midpoint=0 if measure == "P&L" else None,
+                        labels={'x': "Spot Price", 'y': y_label, 'color': measure},
+                        title=f"{selected_stock} {option} {measure} by Spot Price and {y_label}")
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Monte Carlo pricing, including path-dependent payoffs
+    with st.expander("Monte Carlo Pricing"):
+        payoff = st.selectbox("Payoff", PAYOFFS)
+        barrier, barrier_type = None, BARRIER_TYPES[0]
+        if payoff == 'barrier':
+            barrier_type = st.selectbox("Barrier Type", BARRIER_TYPES)
+            barrier = st.number_input("Barrier Level", value=float(S) * 1.2)
+        n_paths = st.select_slider("Number of Paths", options=[10_000, 100_000, 1_000_000], value=100_000)
+        if st.button("Run Simulation"):
+            for option in ('call', 'put'):
+                with stage(f"monte carlo {option}"):
+                    result = monte_carlo_price(S, K, T, r, sigma, option=option, payoff=payoff, n_paths=n_paths,
+                                               barrier=barrier, barrier_type=barrier_type, seed=0)
+                st.write(f"**{option.title()} ({payoff}):** ${result['price']:.4f} ± {result['std_error']:.4f} "
+                         f"({result['n_paths']:,} paths, closed-form European ${result['european_price']:.4f})")
+
+    # Live repricing from a replayed price feed
+    st.header("Live Repricing")
+    col1, col2 = st.columns(2)
+    live_mode = col1.checkbox("Live mode (replay of recorded bars)")
+    threshold_bp = col2.number_input("Reprice threshold (bp)", min_value=0.0, value=10.0, step=5.0)
+    if live_mode:
+        live = start_live(st.session_state.stocks_list, T, float(r), estimator, threshold_bp / 10_000)
+        for ticker, message in live['errors'].items():
+            st.warning(f"Live mode skips {ticker}: {message}")
+        if 'error' in live:
+            st.error(f"Live mode unavailable: {live['error']}")
+        else:
+            live_section()
+    else:
+        stop_live()
+
     # Visualization
     st.header("Market Trend Visualization")
     period = st.selectbox(f"Select period for {selected_stock}", ["1mo", "3mo", "6mo", "1y", "max"], index=0)
-    stock_data = fetch_historical_data(selected_stock, period=period)
-    fig = px.line(stock_data, x=stock_data.index, y="Close", title=f"{selected_stock} Price History - {period}")
-    fig.update_xaxes(title="Date")
-    fig.update_yaxes(title="Price")
-    st.plotly_chart(fig, use_container_width=True)
+    stock_data = chart_history(selected_stock, period)
+    with stage("chart market trend"):
+        fig = px.line(stock_data, x=stock_data.index, y="Close", title=f"{selected_stock} Price History - {period}", render_mode="webgl")
+        fig.update_xaxes(title="Date")
+        fig.update_yaxes(title="Price")
+        st.plotly_chart(fig, use_container_width=True)
 
     # Allowing multiple stock inputs
     st.sidebar.header("Visualize More Stocks")
     stock_input = st.sidebar.text_area("Enter stock tickers separated by commas (e.g., AAPL, NVDA, AMZN)", height=50)
     if st.sidebar.button("Add Stocks"):
-        tickers = [ticker.strip().upper() for ticker in stock_input.split(',')]
+        tickers = [ticker.strip().upper() for ticker in stock_input.split(',') if ticker.strip()]
+        histories, errors = fetch_bulk_history(tickers, period="1y")
         for stock in tickers:
+            if stock in errors:
+                st.error(f"Could not load {stock}: {errors[stock]}")
+                continue
             if stock not in st.session_state.stocks_list:
                 st.session_state.stocks_list.append(stock)
-            stock_price = fetch_stock_data(stock)
-            stock_volatility = calculate_volatility(stock)
-            stock_history = fetch_historical_data(stock, period="1y")
-            
+            summary = summarize_history(histories[stock])
+            stock_history = chart_history(stock, "1y", _history=summary['history'])
+
             st.subheader(f"{stock} Information")
-            st.write(f"**Current Price:** ${stock_price:.2f}")
-            st.write(f"**Volatility:** {stock_volatility:.2%}")
-            
-            fig = px.line(stock_history, x=stock_history.index, y="Close", title=f"{stock} Price History - 1 Year")
-            fig.update_xaxes(title="Date")
-            fig.update_yaxes(title="Price")
-            st.plotly_chart(fig, use_container_width=True)
+            st.write(f"**Current Price:** ${summary['spot']:.2f}")
+            st.write(f"**Volatility:** {summary['volatility']:.2%}")
+
+            with stage(f"chart {stock}"):
+                fig = px.line(stock_history, x=stock_history.index, y="Close", title=f"{stock} Price History - 1 Year", render_mode="webgl")
+                fig.update_xaxes(title="Date")
+                fig.update_yaxes(title="Price")
+                st.plotly_chart(fig, use_container_width=True)
 
     # Documentation and User Guide
     st.header("User Guide")
@@ -108,7 +267,8 @@ def display_black_scholes_model():
     - **K**: Strike price
     - **T**: Time to expiration (in years)
     - **r**: Risk-free interest rate
-    - **sigma**: Volatility of the stock
+    - **sigma**: Volatility of the stock, estimated from one year of daily bars with the selected estimator
+      (close-to-close, EWMA, Parkinson, Garman-Klass, Yang-Zhang or GARCH(1,1))
 
     ### How to Use
     1. Enter the stock ticker symbol in the sidebar.
@@ -116,5 +276,7 @@ def display_black_scholes_model():
     3. View the calculated option prices and decision support recommendations.
     4. Check the market trend visualization for the selected stock.
     5. Add multiple stock tickers in the sidebar to visualize their information.
+    6. Turn on Live mode to reprice a strike ladder for every displayed stock as replayed prices tick in;
+       contracts are only repriced when their underlying moves by more than the threshold.
     """)
 
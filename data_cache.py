@@ -0,0 +1,247 @@
+import json
+import os
+import threading
+import time
+import zlib
+import numpy as np
+import pandas as pd
+from instrumentation import count, stage
+
+# Supported yfinance periods, shortest first, with the offset used to slice them from a longer history
+PERIODS = {
+    '1d': pd.DateOffset(days=1),
+    '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    'ytd': None,
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+    'max': None,
+}
+_PERIOD_RANK = {period: rank for rank, period in enumerate(PERIODS)}
+
+try:
+    import pyarrow  # noqa: F401
+    _SUFFIX = '.parquet'
+except ImportError:
+    _SUFFIX = '.pkl'
+
+# Function to slice the bars belonging to a yfinance-style period out of a longer history
+def slice_period(frame, period):
+    if frame.empty or period == 'max':
+        return frame
+    last = frame.index[-1]
+    if period == 'ytd':
+        return frame[frame.index >= last.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)]
+    if period == '1d':
+        return frame[frame.index.normalize() == last.normalize()]
+    return frame[frame.index > last - PERIODS[period]]
+
+# Data provider backed by yfinance
+class YFinanceProvider:
+    def history(self, ticker, period=None, start=None, interval="1d"):
+        import yfinance as yf
+        stock = yf.Ticker(ticker)
+        if start is not None:
+            return stock.history(start=start, interval=interval)
+        return stock.history(period=period, interval=interval)
+
+# Data provider serving fixture frames, either given directly or read from <dir>/<TICKER>.csv
+class FixtureProvider:
+    def __init__(self, frames=None, directory=None):
+        self.frames = dict(frames or {})
+        self.directory = directory
+
+    def _frame(self, ticker):
+        if ticker not in self.frames and self.directory is not None:
+            path = os.path.join(self.directory, f"{ticker}.csv")
+            if os.path.exists(path):
+                self.frames[ticker] = pd.read_csv(path, index_col=0, parse_dates=True)
+        return self.frames.get(ticker, pd.DataFrame())
+
+    def history(self, ticker, period=None, start=None, interval="1d"):
+        frame = self._frame(ticker)
+        if start is not None:
+            return frame[frame.index >= pd.Timestamp(start, tz=frame.index.tz)].copy()
+        return slice_period(frame, period or 'max').copy()
+
+# Data provider generating deterministic synthetic OHLCV bars per ticker, with optional simulated
+# network latency, for benchmarks and offline runs
+class SyntheticProvider:
+    def __init__(self, n_bars=2520, end="2024-12-31", latency=0.0, seed=0):
+        self.n_bars = n_bars
+        self.end = end
+        self.latency = latency
+        self.seed = seed
+        self._index = pd.bdate_range(end=end, periods=n_bars, tz='America/New_York')
+        self._frames = {}
+
+    def _frame(self, ticker):
+        if ticker not in self._frames:
+            rng = np.random.default_rng([self.seed, zlib.crc32(ticker.encode())])
+            sigma = rng.uniform(0.15, 0.6) / np.sqrt(252)
+            close = rng.uniform(20, 500) * np.exp(np.cumsum(rng.normal(0.0002, sigma, self.n_bars)))
+            open_ = close * np.exp(rng.normal(0, sigma / 2, self.n_bars))
+            spread = np.abs(rng.normal(0, sigma, self.n_bars))
+            self._frames[ticker] = pd.DataFrame({
+                'Open': open_,
+                'High': np.maximum(open_, close) * np.exp(spread),
+                'Low': np.minimum(open_, close) * np.exp(-spread),
+                'Close': close,
+                'Volume': rng.integers(1e5, 1e7, self.n_bars).astype(float),
+            }, index=self._index)
+        return self._frames[ticker]
+
+    def history(self, ticker, period=None, start=None, interval="1d"):
+        if self.latency:
+            time.sleep(self.latency)
+        frame = self._frame(ticker)
+        if start is not None:
+            return frame[frame.index >= pd.Timestamp(start, tz=frame.index.tz)].copy()
+        return slice_period(frame, period or 'max').copy()
+
+# Persistent OHLCV store keyed by ticker and interval. Each key is one columnar file holding the
+# longest period requested so far; stale keys are topped up with only the bars after the last
+# stored date, and the store is kept under max_bytes by evicting the least recently used keys.
+class OHLCVCache:
+    def __init__(self, root, provider=None, ttl=900, max_bytes=512 * 1024 ** 2, offline=False, min_period='1y'):
+        self.root = root
+        self.provider = provider or YFinanceProvider()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.min_period = min_period
+        self.stats = {'hits': 0, 'misses': 0, 'incremental': 0, 'bytes_written': 0}
+        self._frames = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        os.makedirs(root, exist_ok=True)
+        self._index_path = os.path.join(root, 'index.json')
+        self._index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self._index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        tmp = self._index_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp, self._index_path)
+
+    def _path(self, key):
+        return os.path.join(self.root, key + _SUFFIX)
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _read(self, key):
+        if key not in self._frames:
+            path = self._path(key)
+            if not os.path.exists(path):
+                return None
+            self._frames[key] = pd.read_parquet(path) if _SUFFIX == '.parquet' else pd.read_pickle(path)
+        return self._frames[key]
+
+    def _write(self, key, frame, entry):
+        path = self._path(key)
+        # Written to a temporary file first so an interrupted write never leaves a truncated file
+        tmp = path + '.tmp'
+        if _SUFFIX == '.parquet':
+            frame.to_parquet(tmp)
+        else:
+            frame.to_pickle(tmp)
+        os.replace(tmp, path)
+        entry['bytes'] = os.path.getsize(path)
+        self.stats['bytes_written'] += entry['bytes']
+        with self._lock:
+            self._frames[key] = frame
+            self._index[key] = entry
+            self._evict(keep=key)
+            self._save_index()
+
+    def _evict(self, keep):
+        total = sum(entry['bytes'] for entry in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]['accessed_at']):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self._index.pop(key)['bytes']
+            self._frames.pop(key, None)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _count(self, name):
+        self.stats[name] += 1
+        count(f"cache_{name}")
+
+    def _download(self, ticker, **kwargs):
+        with stage(f"download {ticker}"):
+            frame = self.provider.history(ticker, **kwargs)
+        count('rows_downloaded', len(frame))
+        # In-memory size of the parsed frame; the provider does not expose the bytes received on the wire
+        count('bytes_loaded', int(frame.memory_usage(index=True).sum()))
+        return frame
+
+    # Function to return the history for a ticker, fetching only what the store is missing
+    def get_history(self, ticker, period="1mo", interval="1d"):
+        key = f"{ticker.upper()}_{interval}"
+        with self._key_lock(key):
+            entry = self._index.get(key)
+            frame = self._read(key) if entry else None
+            now = time.time()
+
+            if frame is None:
+                if self.offline:
+                    raise LookupError(f"No cached history for {ticker} ({interval}) in offline mode")
+                fetch_period = max(period, self.min_period, key=_PERIOD_RANK.get)
+                frame = self._download(ticker, period=fetch_period, interval=interval)
+                self._count('misses')
+                if frame.empty:
+                    return frame
+                self._write(key, frame, {'covered': fetch_period, 'fetched_at': now, 'accessed_at': now})
+            elif not self.offline and _PERIOD_RANK[period] > _PERIOD_RANK[entry['covered']]:
+                frame = self._download(ticker, period=period, interval=interval)
+                self._count('misses')
+                if frame.empty:
+                    return frame
+                self._write(key, frame, {'covered': period, 'fetched_at': now, 'accessed_at': now})
+            elif not self.offline and now - entry['fetched_at'] > self.ttl:
+                # Re-fetch from the last stored bar so a partial bar from the previous call is replaced
+                new = self._download(ticker, start=frame.index[-1].date(), interval=interval)
+                self._count('incremental')
+                if not new.empty:
+                    frame = pd.concat([frame[frame.index < new.index[0]], new])
+                self._write(key, frame, dict(entry, fetched_at=now, accessed_at=now))
+            else:
+                self._count('hits')
+                with self._lock:
+                    entry['accessed_at'] = now
+                    self._save_index()
+
+        return slice_period(frame, period).copy()
+
+_default_cache = None
+
+# Function to return the process-wide cache, configured from BSM_CACHE_DIR / BSM_OFFLINE
+def get_cache():
+    global _default_cache
+    if _default_cache is None:
+        root = os.environ.get('BSM_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'black-scholes-model', 'ohlcv'))
+        _default_cache = OHLCVCache(root, offline=os.environ.get('BSM_OFFLINE') == '1')
+    return _default_cache
+
+# Function to replace the process-wide cache, e.g. with one backed by a FixtureProvider
+def set_cache(cache):
+    global _default_cache
+    _default_cache = cache
@@ -0,0 +1,58 @@
+import numpy as np
+
+# Target number of points per series; roughly one point per horizontal pixel of a full-width chart
+DEFAULT_WIDTH = 1000
+METHODS = ('lttb', 'minmax')
+
+# Function to pick n_out indices of a series with Largest-Triangle-Three-Buckets: the first and last
+# points are kept and each bucket in between contributes the point forming the largest triangle
+# with the previously kept point and the next bucket's average. x defaults to the positions.
+def lttb(y, n_out, x=None):
+    y = np.asarray(y, dtype=float)
+    n = y.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+    y = np.where(np.isnan(y), np.nanmean(y) if np.isfinite(y).any() else 0.0, y)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    sizes = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / sizes
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / sizes
+    # The bucket after the last one is the final point
+    mean_x, mean_y = np.append(mean_x[1:], x[-1]), np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - mean_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (mean_y[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+# Function to pick at most n_out indices of a series keeping the minimum and maximum of each of
+# n_out // 2 equal buckets, so spikes survive; fully vectorized
+def minmax(y, n_out):
+    y = np.asarray(y, dtype=float)
+    n = y.size
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    edges = np.linspace(0, n, n_out // 2 + 1).astype(int)
+    bucket = np.repeat(np.arange(edges.size - 1), np.diff(edges))
+    # Within each bucket, positions sorted by value: the first is the minimum, the last the maximum
+    order = np.lexsort((np.nan_to_num(y, nan=np.nanmean(y) if np.isfinite(y).any() else 0.0), bucket))
+    return np.unique(np.concatenate([order[edges[:-1]], order[edges[1:] - 1]]))
+
+# Function to downsample a frame for plotting to about width points per series; rows picked for any
+# of the columns are kept, so every series is drawn from the same rows
+def downsample_frame(frame, columns, width=DEFAULT_WIDTH, method='lttb'):
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method {method!r}; expected one of {METHODS}")
+    if len(frame) <= width:
+        return frame
+    pick = lttb if method == 'lttb' else minmax
+    columns = [columns] if isinstance(columns, str) else columns
+    rows = np.unique(np.concatenate([pick(frame[column].to_numpy(dtype=float), width) for column in columns]))
+    return frame.iloc[rows]
@@ -1,13 +1 @@
-import numpy as np
-from scipy.stats import norm
-
-def calculate_d1_d2(S, K, T, r, sigma):
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-    return d1, d2
-
-def black_scholes(S, K, T, r, sigma):
-    d1, d2 = calculate_d1_d2(S, K, T, r, sigma)
-    call_price = S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
-    put_price = K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
-    return call_price, put_price
+from pricing import calculate_d1_d2, black_scholes, black_scholes_greeks
@@ -0,0 +1,108 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Ring buffer of the last `window` values per ticker with a running sum. The sum is rebuilt from the
+# buffer each time a ticker's buffer wraps, so floating-point drift never spans more than one window.
+class _RollingSum:
+    def __init__(self, n, window):
+        self.window = window
+        self.buf = np.zeros((n, window))
+        self.sum = np.zeros(n)
+        self.pos = np.zeros(n, dtype=np.intp)
+
+    def push(self, rows, values):
+        pos = self.pos[rows]
+        self.sum[rows] += values - self.buf[rows, pos]
+        self.buf[rows, pos] = values
+        pos = (pos + 1) % self.window
+        self.pos[rows] = pos
+        wrapped = rows[pos == 0]
+        if wrapped.size:
+            self.sum[wrapped] = self.buf[wrapped].sum(axis=1)
+
+    def load(self, tail):
+        # tail holds the most recent values oldest-first, with NaN for bars a ticker does not have yet
+        tail = np.nan_to_num(tail[-self.window:].T)
+        self.buf[:] = 0.0
+        self.buf[:, :tail.shape[1]] = tail
+        self.sum = self.buf.sum(axis=1)
+        self.pos[:] = tail.shape[1] % self.window
+
+# Function to compute a trailing rolling mean over axis 0, NaN until the window is full
+def _rolling_mean(values, window):
+    out = np.full(values.shape, np.nan)
+    if values.shape[0] >= window:
+        out[window - 1:] = sliding_window_view(values, window, axis=0).sum(axis=-1) / window
+    return out
+
+# Incremental version of the indicators built by utils.prepare_trading_data (Return, MA10, MA50,
+# RSI and Signal) for a fixed universe of tickers. Each bar costs O(1) per ticker; state can be
+# bootstrapped in bulk from a (bars x tickers) close array, where tickers with a shorter history
+# are padded with leading NaNs.
+class IndicatorEngine:
+    def __init__(self, tickers, short_window=10, long_window=50, rsi_window=14):
+        self.tickers = list(tickers)
+        self.columns = {ticker: i for i, ticker in enumerate(self.tickers)}
+        n = len(self.tickers)
+        self.rsi_window = rsi_window
+        self.last_close = np.full(n, np.nan)
+        self.last_return = np.full(n, np.nan)
+        self.count = np.zeros(n, dtype=np.int64)
+        self._short = _RollingSum(n, short_window)
+        self._long = _RollingSum(n, long_window)
+        self._up = _RollingSum(n, rsi_window)
+
+    # Function to compute the indicators for a full close history and load the rolling state from it
+    def bootstrap(self, closes):
+        closes = np.asarray(closes, dtype=float).reshape(len(closes), -1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.full(closes.shape, np.nan)
+            returns[1:] = closes[1:] / closes[:-1] - 1
+            up = np.zeros(closes.shape)
+            up[1:] = closes[1:] - closes[:-1] > 0
+        count = np.cumsum(~np.isnan(closes), axis=0)
+
+        result = {
+            'Return': returns,
+            'MA10': _rolling_mean(closes, self._short.window),
+            'MA50': _rolling_mean(closes, self._long.window),
+            'RSI': np.where(count >= self.rsi_window, _rolling_mean(up, self.rsi_window) * 100, np.nan),
+        }
+        result['Signal'] = np.where(result['MA10'] > result['MA50'], 1, 0)
+
+        self.last_close = closes[-1].copy()
+        self.last_return = returns[-1].copy()
+        self.count = count[-1].copy()
+        self._short.load(closes)
+        self._long.load(closes)
+        self._up.load(np.where(np.isnan(closes), np.nan, up))
+        return result
+
+    # Function to apply one new bar; closes is aligned with self.tickers and NaN means no new bar
+    def update(self, closes):
+        closes = np.asarray(closes, dtype=float)
+        rows = np.flatnonzero(~np.isnan(closes))
+        new = closes[rows]
+        previous = self.last_close[rows]
+        with np.errstate(invalid='ignore'):
+            self.last_return[rows] = new / previous - 1
+            up = (new - previous > 0).astype(float)
+        self._short.push(rows, new)
+        self._long.push(rows, new)
+        self._up.push(rows, up)
+        self.last_close[rows] = new
+        self.count[rows] += 1
+        return self.current()
+
+    # Function to return the latest indicator values for every ticker, NaN where history is too short
+    def current(self):
+        ma_short = np.where(self.count >= self._short.window, self._short.sum / self._short.window, np.nan)
+        ma_long = np.where(self.count >= self._long.window, self._long.sum / self._long.window, np.nan)
+        rsi = np.where(self.count >= self.rsi_window, self._up.sum / self.rsi_window * 100, np.nan)
+        return {
+            'Return': self.last_return.copy(),
+            'MA10': ma_short,
+            'MA50': ma_long,
+            'RSI': rsi,
+            'Signal': np.where(ma_short > ma_long, 1, 0),
+        }
@@ -0,0 +1,141 @@
+import contextvars
+import cProfile
+import functools
+import heapq
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+_current_run = contextvars.ContextVar('bsm_current_run', default=None)
+_slowest_profiles = []
+_profiles_lock = threading.Lock()
+MAX_PROFILES = 5
+
+# Timings and counters collected during one page render (one Streamlit rerun)
+class RunStats:
+    def __init__(self, page):
+        self.page = page
+        self.started_at = time.time()
+        self.seconds = None
+        self.stages = []
+        self.counters = defaultdict(float)
+        self.profiler = None
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add_stage(self, name, start, seconds):
+        with self._lock:
+            self.stages.append({'stage': name, 'offset': start - self._start, 'seconds': seconds})
+
+    def add_count(self, name, amount):
+        with self._lock:
+            self.counters[name] += amount
+
+    def to_dict(self):
+        return {
+            'page': self.page,
+            'started_at': self.started_at,
+            'seconds': self.seconds,
+            'stages': self.stages,
+            'counters': dict(self.counters),
+        }
+
+# Function to begin collecting stats for a page render, optionally under cProfile
+def start_run(page, profile=False):
+    run = RunStats(page)
+    _current_run.set(run)
+    if profile:
+        run.profiler = cProfile.Profile()
+        run.profiler.enable()
+    return run
+
+# Function to finish a page render: append its stats to the JSON-lines log and keep its profile
+# if it is among the slowest profiled reruns
+def end_run(run, log_path=None):
+    run.seconds = time.perf_counter() - run._start
+    _current_run.set(None)
+    if run.profiler is not None:
+        run.profiler.disable()
+        with _profiles_lock:
+            entry = (run.seconds, run.started_at, run.page, run.profiler)
+            if len(_slowest_profiles) < MAX_PROFILES:
+                heapq.heappush(_slowest_profiles, entry)
+            else:
+                heapq.heappushpop(_slowest_profiles, entry)
+        run.profiler = None
+    log_path = log_path or os.environ.get('BSM_PERF_LOG', os.path.join(os.path.expanduser('~'), '.cache', 'black-scholes-model', 'perf.jsonl'))
+    try:
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        with open(log_path, 'a') as f:
+            f.write(json.dumps(run.to_dict()) + '\n')
+    except OSError:
+        pass
+    return run
+
+# Function to return the stats object for the render running in this context, if any
+def current_run():
+    return _current_run.get()
+
+# Context manager timing one stage of the current render; a no-op outside a render
+@contextmanager
+def stage(name):
+    run = _current_run.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if run is not None:
+            run.add_stage(name, start, time.perf_counter() - start)
+
+# Decorator timing every call of a function as a stage named after it
+def timed(name=None):
+    def decorator(fn):
+        label = name or fn.__name__
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Function to add to a counter of the current render (cache hits, rows processed, bytes loaded)
+def count(name, amount=1):
+    run = _current_run.get()
+    if run is not None:
+        run.add_count(name, amount)
+
+# Function to return (seconds, page, top functions report) for the slowest profiled reruns
+def slowest_profiles(limit=20):
+    with _profiles_lock:
+        entries = sorted(_slowest_profiles, reverse=True)
+    reports = []
+    for seconds, _, page, profiler in entries:
+        buffer = io.StringIO()
+        pstats.Stats(profiler, stream=buffer).sort_stats('cumulative').print_stats(limit)
+        reports.append((seconds, page, buffer.getvalue()))
+    return reports
+
+# Function to render the diagnostics panel for a finished render in the Streamlit sidebar, with any
+# background errors ({source: exception}, e.g. page warm-up imports) listed as warnings
+def render_diagnostics(run, errors=None):
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander("Diagnostics", expanded=True):
+        st.write(f"**{run.page}** rendered in {run.seconds * 1000:.0f} ms")
+        if run.stages:
+            stages = pd.DataFrame(run.stages)
+            stages['ms'] = stages['seconds'] * 1000
+            st.dataframe(stages[['stage', 'ms']].sort_values('ms', ascending=False), hide_index=True)
+        if run.counters:
+            st.json(dict(run.counters))
+        for source, error in (errors or {}).items():
+            st.warning(f"{source}: {type(error).__name__}: {error}")
+        for seconds, page, report in slowest_profiles():
+            st.caption(f"Profile: {page}, {seconds * 1000:.0f} ms")
+            st.code(report)
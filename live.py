@@ -0,0 +1,168 @@
+import threading
+import time
+from collections import deque
+import numpy as np
+import pandas as pd
+from portfolio import close_panel
+from pricing import black_scholes
+
+# Latest tick per ticker since the last drain. Producers overwrite older ticks, so a slow consumer
+# only ever sees one (the newest) price per ticker and never falls behind the feed.
+class _TickBuffer:
+    def __init__(self):
+        self._ticks = {}
+        self._lock = threading.Lock()
+        self.received = 0
+        self.coalesced = 0
+
+    def put(self, ticks):
+        with self._lock:
+            self.received += len(ticks)
+            self.coalesced += sum(ticker in self._ticks for ticker in ticks)
+            self._ticks.update(ticks)
+
+    def drain(self):
+        with self._lock:
+            ticks, self._ticks = self._ticks, {}
+        return ticks
+
+# Price feed replaying recorded bars on a background thread, standing in for a live subscription.
+# Successive closes are linearly interpolated over steps_per_bar ticks, and every tick_interval
+# seconds each ticker publishes (price, publish time) into a coalescing buffer read with drain().
+# The thread stops itself once nobody has drained for idle_timeout seconds (e.g. the Streamlit
+# session that owned it has gone away); start() resumes it.
+class ReplayFeed:
+    def __init__(self, closes, tick_interval=0.05, steps_per_bar=20, loop=True, idle_timeout=30.0):
+        closes = closes.ffill().bfill()
+        self.closes = closes
+        self.tickers = list(closes.columns)
+        self.errors = {}
+        self.tick_interval = tick_interval
+        self.loop = loop
+        self.idle_timeout = idle_timeout
+        self._last_drain = time.perf_counter()
+        bars = closes.to_numpy(dtype=float)
+        fractions = np.arange(steps_per_bar) / steps_per_bar
+        self._path = (bars[:-1, None, :] * (1 - fractions[:, None]) + bars[1:, None, :] * fractions[:, None]).reshape(-1, bars.shape[1])
+        self._path = np.vstack([self._path, bars[-1:]])
+        self._buffer = _TickBuffer()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # Function to build a replay feed from the cached daily history of the given tickers in one bulk
+    # fetch; tickers without data are left out and reported in the feed's errors
+    @classmethod
+    def from_history(cls, tickers, period="1mo", **kwargs):
+        closes, errors = close_panel(tickers, period=period)
+        if closes.empty:
+            raise LookupError(f"No recorded bars to replay: {errors}")
+        feed = cls(closes, **kwargs)
+        feed.errors = errors
+        return feed
+
+    def _run(self):
+        step = 0
+        next_tick = time.perf_counter()
+        while not self._stop.is_set():
+            if self.idle_timeout is not None and time.perf_counter() - self._last_drain > self.idle_timeout:
+                break
+            if step == len(self._path):
+                if not self.loop:
+                    break
+                step = 0
+            now = time.perf_counter()
+            self._buffer.put({ticker: (price, now) for ticker, price in zip(self.tickers, self._path[step])})
+            step += 1
+            next_tick += self.tick_interval
+            self._stop.wait(max(0.0, next_tick - time.perf_counter()))
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._last_drain = time.perf_counter()
+            self._thread = threading.Thread(target=self._run, name="replay-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    # Function to take the newest tick per ticker published since the previous drain
+    def drain(self):
+        self._last_drain = time.perf_counter()
+        return self._buffer.drain()
+
+    @property
+    def stats(self):
+        return {'ticks': self._buffer.received, 'coalesced': self._buffer.coalesced}
+
+# Incremental repricer for a book of European contracts (DataFrame with ticker, K, T, r and sigma).
+# On each batch of ticks only the contracts whose underlying moved by more than threshold (relative
+# to the spot they were last priced at) are repriced, in one vectorized black_scholes call.
+class LiveRepricer:
+    def __init__(self, contracts, spots, threshold=0.001, window=5.0):
+        self.contracts = contracts.reset_index(drop=True)
+        self.tickers = pd.Index(pd.unique(self.contracts['ticker']))
+        self.codes = self.tickers.get_indexer(self.contracts['ticker'])
+        self.threshold = threshold
+        self.window = window
+        self.spot = np.array([spots[ticker] for ticker in self.tickers], dtype=float)
+        self._args = [self.contracts[name].to_numpy(dtype=float) for name in ('K', 'T', 'r', 'sigma')]
+        self.priced_spot = self.spot[self.codes].copy()
+        self.call, self.put = (np.atleast_1d(x).copy() for x in black_scholes(self.priced_spot, *self._args))
+        self.updated_at = np.full(len(self.contracts), time.perf_counter())
+        self.reprices = 0
+        self._events = deque()
+        self._lags = deque()
+
+    # Function to apply drained ticks ({ticker: (price, publish time)}); returns the repriced row indexes
+    def apply(self, ticks):
+        now = time.perf_counter()
+        codes = self.tickers.get_indexer(list(ticks))
+        known = codes >= 0
+        for (price, stamp), code in zip(np.array(list(ticks.values()), dtype=float)[known], codes[known]):
+            self.spot[code] = price
+            self._lags.append((now, now - stamp))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            moved = np.abs(self.spot[self.codes] / self.priced_spot - 1) > self.threshold
+        rows = np.flatnonzero(moved)
+        if rows.size:
+            S = self.spot[self.codes[rows]]
+            call, put = black_scholes(S, *(arg[rows] for arg in self._args))
+            self.call[rows], self.put[rows] = call, put
+            self.priced_spot[rows] = S
+            self.updated_at[rows] = now
+            self.reprices += rows.size
+            self._events.append((now, rows.size))
+
+        cutoff = now - self.window
+        while self._events and self._events[0][0] < cutoff:
+            self._events.popleft()
+        while self._lags and self._lags[0][0] < cutoff:
+            self._lags.popleft()
+        return rows
+
+    # Function to return feed lag (ms) and reprice rate (contracts/s) over the last `window` seconds
+    def metrics(self):
+        lags = np.array([lag for _, lag in self._lags]) * 1000
+        return {
+            'lag_ms_mean': lags.mean() if lags.size else np.nan,
+            'lag_ms_max': lags.max() if lags.size else np.nan,
+            'reprices_per_second': sum(n for _, n in self._events) / self.window,
+            'reprices_total': self.reprices,
+        }
+
+    # Function to return the book with current spots and prices
+    def frame(self):
+        frame = self.contracts.copy()
+        frame['spot'] = self.spot[self.codes]
+        frame['call'] = self.call
+        frame['put'] = self.put
+        return frame
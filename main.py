@@ -1,21 +1,29 @@
+import os
 import streamlit as st
-from black_scholes import display_black_scholes_model
-from stock_price_prediction import display_stock_price_prediction
-from option_price_prediction import display_option_price_prediction
-from trading_signal_generation import display_trading_signal_generation
+from instrumentation import start_run, end_run, render_diagnostics
+from page_loader import PAGES, load_page, warm_up, warm_up_errors
 
 # Main application
 st.set_page_config(page_title="Real-Time Stock Analysis", layout="wide")
 
-# Page navigation
+# Page navigation; only the selected page module is imported
 st.sidebar.title("Navigation")
-page = st.sidebar.radio("Go to", ["Black-Scholes Model", "Stock Price Prediction", "Option Price Prediction", "Trading Signal Generation"])
+page = st.sidebar.radio("Go to", list(PAGES))
 
-if page == "Black-Scholes Model":
-    display_black_scholes_model()
-elif page == "Stock Price Prediction":
-    display_stock_price_prediction()
-elif page == "Option Price Prediction":
-    display_option_price_prediction()
-elif page == "Trading Signal Generation":
-    display_trading_signal_generation()
+# Diagnostics: stage timings and counters for this rerun, optionally profiled with cProfile
+st.sidebar.header("Diagnostics")
+show_diagnostics = st.sidebar.checkbox("Show diagnostics", value=False)
+profile = st.sidebar.checkbox("Profile reruns", value=os.environ.get('BSM_PROFILE') == '1')
+run = start_run(page, profile=profile)
+
+try:
+    load_page(page)()
+finally:
+    end_run(run)
+
+if show_diagnostics:
+    render_diagnostics(run, errors={f"Warm-up import of {name}": e for name, e in dict(warm_up_errors).items()})
+
+# Preload the other pages in the background now that this one has been drawn
+if os.environ.get('BSM_WARM_UP', '1') == '1':
+    warm_up()
@@ -0,0 +1,77 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from data_cache import get_cache
+from utils import volatility_from_history
+
+# Function to fetch one ticker's history through the cache, retrying transient failures with backoff.
+# yfinance reports network and Yahoo errors as an empty frame rather than raising, so an empty
+# result is retried too and only reported once the last attempt is also empty.
+def _fetch_with_retries(cache, ticker, period, interval, retries, backoff):
+    for attempt in range(retries + 1):
+        try:
+            frame = cache.get_history(ticker, period=period, interval=interval)
+        except LookupError:
+            raise
+        except Exception:
+            if attempt == retries:
+                raise
+        else:
+            if not frame.empty:
+                return frame
+            if attempt == retries:
+                raise ValueError(f"No price data returned for {ticker}")
+        time.sleep(backoff * 2 ** attempt)
+
+# Function to download the history of many tickers concurrently with bounded parallelism.
+# Returns (histories, errors): ticker -> DataFrame for successes and ticker -> message for failures.
+# timeout is batch-wide, not per ticker: tickers still outstanding (including any retries) when it
+# expires are reported as timed out.
+def fetch_bulk_history(tickers, period="1y", interval="1d", max_workers=8, timeout=30.0, retries=2, backoff=0.5, cache=None):
+    cache = cache or get_cache()
+    tickers = list(dict.fromkeys(t for t in tickers if t))
+    histories, errors = {}, {}
+    if not tickers:
+        return histories, errors
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(tickers)))
+    # Each task runs in a copy of the caller's context so stage timings reach the current page render
+    futures = {
+        executor.submit(contextvars.copy_context().run, _fetch_with_retries, cache, t, period, interval, retries, backoff): t
+        for t in tickers
+    }
+    done, pending = wait(futures, timeout=timeout)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    for future in done:
+        ticker = futures[future]
+        try:
+            histories[ticker] = future.result()
+        except Exception as e:
+            errors[ticker] = str(e) or type(e).__name__
+    for future in pending:
+        errors[futures[future]] = f"Timed out after {timeout:g}s"
+    return histories, errors
+
+# Function to bulk-download daily histories re-indexed on time-zone-naive, normalized dates, so
+# exchanges in different time zones line up in one panel; when a date appears twice its last bar is
+# kept. Returns (histories, errors) like fetch_bulk_history, with histories in the order requested.
+def fetch_daily_histories(tickers, period="1y", **kwargs):
+    histories, errors = fetch_bulk_history(tickers, period=period, **kwargs)
+    daily = {}
+    for ticker in dict.fromkeys(tickers):
+        if ticker not in histories:
+            continue
+        history = histories[ticker]
+        index = history.index.tz_localize(None) if history.index.tz is not None else history.index
+        history = history.set_axis(index.normalize())
+        daily[ticker] = history[~history.index.duplicated(keep='last')]
+    return daily, errors
+
+# Function to derive spot price, volatility and the chart series from a single downloaded history
+def summarize_history(history):
+    return {
+        'spot': history['Close'].iloc[-1],
+        'volatility': volatility_from_history(history),
+        'history': history,
+    }
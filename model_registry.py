@@ -0,0 +1,100 @@
+import glob
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+import joblib
+import pandas as pd
+from instrumentation import count, stage
+
+# Registry of fitted models keyed by ticker, feature set, estimator hyperparameters and a hash of
+# the training data. Fitted models live in an in-memory LRU and are persisted to disk, so a model
+# is only refit when its training data changes (i.e. when new bars arrive). Only the newest fit per
+# ticker, estimator and hyperparameters is kept: a new fit deletes the one it supersedes.
+class ModelRegistry:
+    def __init__(self, root, max_entries=32):
+        self.root = root
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'fit_seconds': 0.0, 'last_fit_seconds': None}
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    # Function to build the registry key for an estimator trained on X, y: '<model>-<data>', where
+    # <model> hashes ticker, estimator, hyperparameters and columns and <data> the training data
+    def key(self, ticker, estimator, X, y):
+        params = sorted(estimator.get_params().items())
+        model = hashlib.sha1(repr((ticker, type(estimator).__name__, params, list(X.columns), y.name)).encode())
+        data = hashlib.sha1()
+        data.update(pd.util.hash_pandas_object(X, index=True).values.tobytes())
+        data.update(pd.util.hash_pandas_object(y, index=True).values.tobytes())
+        return f"{model.hexdigest()[:20]}-{data.hexdigest()[:20]}"
+
+    # Function to delete the stored fits a new key supersedes (same model, older training data)
+    def _prune(self, key):
+        prefix = key.split('-')[0] + '-'
+        with self._lock:
+            for old in [k for k in self._models if k.startswith(prefix) and k != key]:
+                del self._models[old]
+        for path in glob.glob(os.path.join(self.root, prefix + '*.joblib')):
+            if os.path.basename(path) != key + '.joblib':
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # Function to return a fitted copy of estimator for X, y from memory or disk, fitting it on a miss
+    def get_or_fit(self, ticker, estimator, X, y):
+        key = self.key(ticker, estimator, X, y)
+        path = os.path.join(self.root, key + '.joblib')
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self.stats['hits'] += 1
+                count('model_cache_hits')
+                return self._models[key]
+
+        if os.path.exists(path):
+            with stage(f"load model {type(estimator).__name__}"):
+                model = joblib.load(path)
+            self.stats['disk_hits'] += 1
+            count('model_cache_disk_hits')
+        else:
+            start = time.perf_counter()
+            with stage(f"fit {type(estimator).__name__}"):
+                model = estimator.fit(X, y)
+            elapsed = time.perf_counter() - start
+            self.stats['misses'] += 1
+            count('model_fits')
+            self.stats['fit_seconds'] += elapsed
+            self.stats['last_fit_seconds'] = elapsed
+            # Write then rename so a concurrent joblib.load never sees a partial file
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            joblib.dump(model, tmp)
+            os.replace(tmp, path)
+            self._prune(key)
+
+        with self._lock:
+            self._models[key] = model
+            while len(self._models) > self.max_entries:
+                self._models.popitem(last=False)
+        return model
+
+    # Function to summarize the cache counters for display
+    def summary(self):
+        stats = self.stats
+        text = f"Model cache: {stats['hits']} hits, {stats['disk_hits']} disk hits, {stats['misses']} fits"
+        if stats['last_fit_seconds'] is not None:
+            text += f" (last fit {stats['last_fit_seconds']:.2f}s, total {stats['fit_seconds']:.2f}s)"
+        return text
+
+_default_registry = None
+
+# Function to return the process-wide model registry, stored under BSM_MODEL_DIR when set
+def get_registry():
+    global _default_registry
+    if _default_registry is None:
+        root = os.environ.get('BSM_MODEL_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'black-scholes-model', 'models'))
+        _default_registry = ModelRegistry(root)
+    return _default_registry
@@ -0,0 +1,136 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from pricing import black_scholes
+
+PAYOFFS = ('european', 'asian', 'barrier', 'lookback')
+BARRIER_TYPES = ('up-and-out', 'down-and-out', 'up-and-in', 'down-and-in')
+
+# Function to simulate one chunk of GBM paths and return the running sums needed to combine chunks:
+# (n, sum_y, sum_yy, sum_x, sum_xx, sum_xy) where y is the discounted payoff and x the control
+# variate: the discounted European payoff for path-dependent payoffs, and the discounted terminal
+# spot (whose expectation is S) for the European payoff itself. Paths are stepped through time so
+# memory is O(chunk).
+def _simulate_chunk(S, K, T, r, sigma, option, payoff, barrier, barrier_type, n_paths, n_steps, antithetic, seed):
+    rng = np.random.default_rng(seed)
+    steps = 1 if payoff == 'european' else n_steps
+    dt = T / steps
+    drift = (r - 0.5 * sigma ** 2) * dt
+    vol = sigma * np.sqrt(dt)
+    size = 2 * n_paths if antithetic else n_paths
+
+    log_s = np.full(size, np.log(S), dtype=float)
+    running_sum = np.zeros(size)
+    running_max = np.full(size, S, dtype=float)
+    running_min = np.full(size, S, dtype=float)
+    hit = np.zeros(size, dtype=bool)
+    for _ in range(steps):
+        z = rng.standard_normal(n_paths)
+        if antithetic:
+            z = np.concatenate([z, -z])
+        log_s += drift + vol * z
+        s = np.exp(log_s)
+        if payoff == 'asian':
+            running_sum += s
+        elif payoff == 'lookback':
+            np.maximum(running_max, s, out=running_max)
+            np.minimum(running_min, s, out=running_min)
+        elif payoff == 'barrier':
+            hit |= s >= barrier if barrier_type.startswith('up') else s <= barrier
+    s_T = np.exp(log_s)
+
+    sign = 1.0 if option == 'call' else -1.0
+    european = np.maximum(sign * (s_T - K), 0.0)
+    if payoff == 'european':
+        value = european
+    elif payoff == 'asian':
+        value = np.maximum(sign * (running_sum / steps - K), 0.0)
+    elif payoff == 'lookback':
+        value = np.maximum(sign * ((running_max if option == 'call' else running_min) - K), 0.0)
+    else:
+        alive = ~hit if barrier_type.endswith('out') else hit
+        value = np.where(alive, european, 0.0)
+
+    discount = np.exp(-r * T)
+    y = discount * value
+    x = discount * (s_T if payoff == 'european' else european)
+    if antithetic:
+        y = 0.5 * (y[:n_paths] + y[n_paths:])
+        x = 0.5 * (x[:n_paths] + x[n_paths:])
+    return np.array([y.size, y.sum(), y @ y, x.sum(), x @ x, x @ y])
+
+# Function to turn accumulated sums into a price estimate and standard error, applying the
+# control variate's known expectation when requested
+def _estimate(sums, control_price):
+    n, sy, syy, sx, sxx, sxy = sums
+    mean_y, mean_x = sy / n, sx / n
+    var_y = max(syy / n - mean_y ** 2, 0.0) * n / (n - 1)
+    if control_price is None:
+        return mean_y, np.sqrt(var_y / n), 0.0
+    var_x = max(sxx / n - mean_x ** 2, 0.0) * n / (n - 1)
+    cov = (sxy / n - mean_x * mean_y) * n / (n - 1)
+    beta = cov / var_x if var_x > 0 else 0.0
+    var_resid = max(var_y - 2 * beta * cov + beta ** 2 * var_x, 0.0)
+    return mean_y - beta * (mean_x - control_price), np.sqrt(var_resid / n), beta
+
+# Function to price a European, Asian (arithmetic average), barrier (discretely monitored) or
+# lookback (fixed strike) option by Monte Carlo on the same S, K, T, r, sigma inputs as black_scholes.
+# Paths are simulated in fixed-size chunks, each with its own child seed, and combined in chunk order.
+# Simulation stops after the first chunk at which std_error <= target_error; chunks a parallel batch
+# simulated beyond it are discarded, so results are reproducible for a given seed whatever n_workers is.
+def monte_carlo_price(S, K, T, r, sigma, option='call', payoff='european', n_paths=1_000_000, n_steps=252,
+                      chunk_size=100_000, antithetic=True, control_variate=True, barrier=None,
+                      barrier_type='up-and-out', target_error=None, seed=None, n_workers=1):
+    if payoff not in PAYOFFS:
+        raise ValueError(f"payoff must be one of {PAYOFFS}")
+    if payoff == 'barrier' and (barrier is None or barrier_type not in BARRIER_TYPES):
+        raise ValueError(f"barrier payoffs need a barrier level and a barrier_type in {BARRIER_TYPES}")
+
+    call_price, put_price = black_scholes(S, K, T, r, sigma)
+    european_price = call_price if option == 'call' else put_price
+    # A European payoff cannot be its own control (beta would be exactly 1 and the estimate the
+    # closed form), so it is controlled with the discounted terminal spot, whose expectation is S
+    control_price = (S if payoff == 'european' else european_price) if control_variate else None
+
+    # Each chunk draws at most chunk_size paths (chunk_size // 2 normals per step with antithetic
+    # pairs); the last chunk only draws what is left, so n_paths is honoured (rounded up to even
+    # with antithetic pairs)
+    per_chunk = max(1, chunk_size // 2 if antithetic else chunk_size)
+    draws = max(1, -(-n_paths // 2) if antithetic else n_paths)
+    chunk_draws = [per_chunk] * (draws // per_chunk) + ([draws % per_chunk] if draws % per_chunk else [])
+    n_chunks = len(chunk_draws)
+    seeds = np.random.SeedSequence(seed)
+    n_workers = n_workers or os.cpu_count()
+    batch = n_workers if target_error is not None else n_chunks
+    args = (S, K, T, r, sigma, option, payoff, barrier, barrier_type)
+
+    executor = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else None
+    sums = np.zeros(6)
+    done = 0
+    converged = False
+    try:
+        while done < n_chunks and not converged:
+            count = min(batch, n_chunks - done)
+            chunk_args = [args + (n, n_steps, antithetic, s) for n, s in zip(chunk_draws[done:done + count], seeds.spawn(count))]
+            if executor is not None:
+                results = executor.map(_simulate_chunk, *zip(*chunk_args))
+            else:
+                results = (_simulate_chunk(*a) for a in chunk_args)
+            for result in results:
+                sums += result
+                done += 1
+                if target_error is not None and _estimate(sums, control_price)[1] <= target_error:
+                    converged = True
+                    break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    price, std_error, beta = _estimate(sums, control_price)
+    return {
+        'price': price,
+        'std_error': std_error,
+        'n_paths': int(sums[0]) * (2 if antithetic else 1),
+        'control_beta': beta,
+        'european_price': european_price,
+    }
@@ -0,0 +1,41 @@
+import importlib
+import threading
+from instrumentation import stage
+
+# Page title -> (module, render function). Page modules, and the heavy libraries they pull in
+# (sklearn, plotly, scipy), are only imported when their page is first selected.
+PAGES = {
+    "Black-Scholes Model": ('black_scholes', 'display_black_scholes_model'),
+    "Stock Price Prediction": ('stock_price_prediction', 'display_stock_price_prediction'),
+    "Option Price Prediction": ('option_price_prediction', 'display_option_price_prediction'),
+    "Trading Signal Generation": ('trading_signal_generation', 'display_trading_signal_generation'),
+}
+
+_warm_up_thread = None
+_warm_up_lock = threading.Lock()
+warm_up_errors = {}
+
+# Function to import a page module on first use and return its render function
+def load_page(name):
+    module_name, function = PAGES[name]
+    with stage(f"import {module_name}"):
+        module = importlib.import_module(module_name)
+    return getattr(module, function)
+
+def _preload(module_names):
+    for module_name in module_names:
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            warm_up_errors[module_name] = e
+
+# Function to import the remaining page modules on a background thread, once per process, so a
+# later page switch does not pay their import cost. Call it after the first page has been drawn.
+def warm_up(pages=None):
+    global _warm_up_thread
+    module_names = [PAGES[name][0] for name in (pages or PAGES)]
+    with _warm_up_lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = threading.Thread(target=_preload, args=(module_names,), name="page-warm-up", daemon=True)
+            _warm_up_thread.start()
+    return _warm_up_thread
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+from scipy.special import ndtri
+from market_data import fetch_daily_histories
+from pricing import black_scholes_greeks
+from utils import fetch_risk_free_rate
+
+POSITION_TYPES = ('call', 'put', 'stock')
+GREEKS = ('value', 'delta', 'gamma', 'vega', 'theta')
+
+# Function to build one aligned close-price panel (dates x tickers) from a single bulk download.
+# Dates are normalized so exchanges in different time zones line up; gaps are forward filled and
+# dates before every ticker has traded are dropped. Returns (panel, errors).
+def close_panel(tickers, period="1y", **kwargs):
+    histories, errors = fetch_daily_histories(tickers, period=period, **kwargs)
+    if not histories:
+        return pd.DataFrame(), errors
+    panel = pd.DataFrame({t: history['Close'] for t, history in histories.items()}).sort_index()
+    return panel.ffill().dropna(), errors
+
+# Function to price positions and return their per-unit Greeks as an (n, 5) array in GREEKS order;
+# stock positions have value S and delta 1
+def _unit_greeks(kind, S, K, T, r, sigma):
+    stock = kind == 2
+    K, T = np.where(stock, S, K), np.where(stock, 1.0, T)
+    g = black_scholes_greeks(S, K, T, r, sigma)
+    call = kind == 0
+    out = np.column_stack([
+        np.where(call, g['call'], g['put']),
+        np.where(call, g['call_delta'], g['put_delta']),
+        g['gamma'],
+        g['vega'],
+        np.where(call, g['call_theta'], g['put_theta']),
+    ])
+    out[stock] = [0.0, 1.0, 0.0, 0.0, 0.0]
+    out[stock, 0] = S[stock]
+    return out
+
+# Risk engine for a book of stock and option positions across many underlyings. The return matrix
+# and covariance are computed once from the close panel; position Greeks are priced in one
+# vectorized call and aggregated per underlying with np.bincount, and update_position reprices a
+# single position and adjusts the aggregates in place.
+#
+# positions is a DataFrame with columns ticker, type ('call', 'put' or 'stock'), quantity, K and T
+# (years); optional sigma and r columns default to each underlying's historical volatility and the
+# yield curve rate for T.
+class PortfolioRisk:
+    def __init__(self, positions, panel):
+        self.underlyings = pd.Index(panel.columns)
+        self.spots = panel.iloc[-1].to_numpy(dtype=float)
+        self.log_returns = np.diff(np.log(panel.to_numpy(dtype=float)), axis=0)
+        self.cov = np.cov(self.log_returns, rowvar=False).reshape(len(self.underlyings), len(self.underlyings))
+        self.volatility = np.sqrt(np.diag(self.cov) * 252)
+
+        positions = positions.reset_index(drop=True)
+        self.codes = self.underlyings.get_indexer(positions['ticker'])
+        if (self.codes < 0).any():
+            missing = sorted(set(positions['ticker'][self.codes < 0]))
+            raise KeyError(f"No price history for {missing}")
+        unknown = set(positions['type']) - set(POSITION_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown position types {sorted(unknown)}; expected one of {POSITION_TYPES}")
+        self.kind = positions['type'].map({name: i for i, name in enumerate(POSITION_TYPES)}).to_numpy(copy=True)
+        self.quantity = positions['quantity'].to_numpy(dtype=float, copy=True)
+        self.K = positions['K'].to_numpy(dtype=float, copy=True) if 'K' in positions else np.full(len(positions), np.nan)
+        self.T = positions['T'].to_numpy(dtype=float, copy=True) if 'T' in positions else np.full(len(positions), np.nan)
+        self.sigma = positions['sigma'].to_numpy(dtype=float, copy=True) if 'sigma' in positions else self.volatility[self.codes]
+        self.r = positions['r'].to_numpy(dtype=float, copy=True) if 'r' in positions else self._rates(self.T)
+
+        unit = _unit_greeks(self.kind, self.spots[self.codes], self.K, self.T, self.r, self.sigma)
+        self.position_greeks = unit * self.quantity[:, None]
+        self.totals = np.column_stack([
+            np.bincount(self.codes, weights=self.position_greeks[:, i], minlength=len(self.underlyings))
+            for i in range(len(GREEKS))
+        ])
+
+    @staticmethod
+    def _rates(T):
+        T = np.asarray(T, dtype=float)
+        return np.asarray(fetch_risk_free_rate(np.where(np.isfinite(T) & (T > 0), T, 1.0)), dtype=float)
+
+    # Function to change one position (any of ticker, type, quantity, K, T, sigma, r) and update the
+    # per-underlying aggregates by repricing only that position
+    def update_position(self, index, **changes):
+        old_code, old = self.codes[index], self.position_greeks[index].copy()
+        if 'ticker' in changes:
+            code = self.underlyings.get_loc(changes['ticker'])
+            self.codes[index] = code
+            if 'sigma' not in changes:
+                self.sigma[index] = self.volatility[code]
+        if 'type' in changes:
+            self.kind[index] = POSITION_TYPES.index(changes['type'])
+        for name in ('quantity', 'K', 'T', 'sigma', 'r'):
+            if name in changes:
+                getattr(self, name)[index] = changes[name]
+        if 'T' in changes and 'r' not in changes:
+            self.r[index] = self._rates([self.T[index]])[0]
+
+        i = slice(index, index + 1)
+        unit = _unit_greeks(self.kind[i], self.spots[self.codes[i]], self.K[i], self.T[i], self.r[i], self.sigma[i])
+        self.position_greeks[index] = unit[0] * self.quantity[index]
+        self.totals[old_code] -= old
+        self.totals[self.codes[index]] += self.position_greeks[index]
+
+    # Function to return the aggregated Greeks per underlying, with dollar delta and dollar gamma
+    def greeks(self):
+        frame = pd.DataFrame(self.totals, index=self.underlyings, columns=list(GREEKS))
+        frame['spot'] = self.spots
+        frame['dollar_delta'] = frame['delta'] * self.spots
+        frame['dollar_gamma'] = frame['gamma'] * self.spots ** 2
+        return frame
+
+    # Function to compute delta-normal (parametric) VaR and expected shortfall over horizon days
+    def parametric_var(self, confidence=0.99, horizon=1):
+        dollar_delta = self.totals[:, 1] * self.spots
+        std = np.sqrt(dollar_delta @ self.cov @ dollar_delta * horizon)
+        z = ndtri(confidence)
+        es = std * np.exp(-0.5 * z * z) / np.sqrt(2 * np.pi) / (1 - confidence)
+        return {'var': z * std, 'es': es, 'std': std, 'confidence': confidence, 'horizon': horizon}
+
+    # Function to compute historical-simulation VaR and expected shortfall with a delta-gamma P&L
+    # for every historical return scenario at once; multi-day horizons scale returns by sqrt(horizon)
+    def historical_var(self, confidence=0.99, horizon=1):
+        moves = self.spots * np.expm1(self.log_returns * np.sqrt(horizon))
+        pnl = moves @ self.totals[:, 1] + 0.5 * (moves ** 2) @ self.totals[:, 2]
+        var = -np.quantile(pnl, 1 - confidence)
+        tail = pnl[pnl <= -var]
+        return {'var': var, 'es': -tail.mean() if tail.size else var, 'pnl': pnl, 'confidence': confidence, 'horizon': horizon}
@@ -0,0 +1,135 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pricing import black_scholes, black_scholes_greeks
+
+INPUT_COLUMNS = ['S', 'K', 'T', 'r', 'sigma']
+_MANIFEST = '_progress.json'
+
+# Function to stream an input file of contracts as Arrow record batches of at most chunk_size rows
+def read_chunks(path, chunk_size):
+    if path.endswith('.parquet'):
+        yield from pq.ParquetFile(path).iter_batches(batch_size=chunk_size)
+    else:
+        import pyarrow.csv as pcsv
+        # Block size is sized from the chunk so a CSV batch holds roughly chunk_size rows
+        options = pcsv.ReadOptions(block_size=max(1 << 20, chunk_size * 64))
+        convert = pcsv.ConvertOptions(column_types={name: pa.float64() for name in INPUT_COLUMNS})
+        pending = None
+        for batch in pcsv.open_csv(path, read_options=options, convert_options=convert):
+            pending = batch if pending is None else pa.Table.from_batches([pending, batch]).combine_chunks().to_batches()[0]
+            while pending.num_rows >= chunk_size:
+                yield pending.slice(0, chunk_size)
+                pending = pending.slice(chunk_size)
+        if pending is not None and pending.num_rows:
+            yield pending
+
+# Worker: price one chunk and write it as a Parquet part file; returns (chunk index, rows priced)
+def price_chunk(index, batch, output_dir, greeks, dtype):
+    table = pa.Table.from_batches([batch])
+    args = [table.column(name).to_numpy(zero_copy_only=False).astype(np.float64, copy=False) for name in INPUT_COLUMNS]
+    if greeks:
+        results = black_scholes_greeks(*args, dtype=dtype)
+    else:
+        call, put = black_scholes(*args, dtype=dtype)
+        results = {'call': call, 'put': put}
+    for name, values in results.items():
+        table = table.append_column(name, pa.array(np.atleast_1d(values)))
+
+    path = os.path.join(output_dir, f"part-{index:06d}.parquet")
+    pq.write_table(table, path + '.tmp')
+    os.replace(path + '.tmp', path)
+    return index, table.num_rows
+
+# Function to read the chunk size and the set of chunk indexes written by an earlier run
+def load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, _MANIFEST)) as f:
+            manifest = json.load(f)
+        return manifest['chunk_size'], set(manifest['completed'])
+    except (OSError, ValueError, KeyError):
+        return None, set()
+
+def _save_manifest(output_dir, completed, chunk_size):
+    path = os.path.join(output_dir, _MANIFEST)
+    with open(path + '.tmp', 'w') as f:
+        json.dump({'chunk_size': chunk_size, 'completed': sorted(completed)}, f)
+    os.replace(path + '.tmp', path)
+
+# Function to price a contract file chunk by chunk on a process pool. At most 2 * workers chunks
+# are in flight, so memory stays constant whatever the input size; with resume=True chunks recorded
+# in the output manifest are skipped. An output directory holding results of another run is refused
+# unless resuming or overwrite=True, which deletes the old part files first.
+def price_file(input_path, output_dir, chunk_size=1_000_000, workers=None, greeks=False, dtype=np.float64, resume=False,
+               overwrite=False, log=sys.stderr):
+    os.makedirs(output_dir, exist_ok=True)
+    previous = glob.glob(os.path.join(output_dir, 'part-*.parquet')) + glob.glob(os.path.join(output_dir, _MANIFEST))
+    if previous and not resume:
+        if not overwrite:
+            raise ValueError(f"{output_dir} already holds priced results; pass --resume to continue that run or --overwrite to replace it")
+        for path in previous:
+            os.remove(path)
+    completed = set()
+    if resume:
+        previous_chunk_size, completed = load_manifest(output_dir)
+        if completed and previous_chunk_size != chunk_size:
+            raise ValueError(f"Cannot resume: {output_dir} was written with --chunk-size {previous_chunk_size}")
+    workers = workers or os.cpu_count()
+    start = time.perf_counter()
+    rows = skipped = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = set()
+        for index, batch in enumerate(read_chunks(input_path, chunk_size)):
+            if index in completed:
+                skipped += batch.num_rows
+                continue
+            if len(in_flight) >= 2 * workers:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                rows += _record(done, completed, output_dir, chunk_size)
+                _report(log, rows, start)
+            in_flight.add(executor.submit(price_chunk, index, batch, output_dir, greeks, dtype))
+        rows += _record(wait(in_flight)[0], completed, output_dir, chunk_size)
+
+    elapsed = time.perf_counter() - start
+    _report(log, rows, start, final=True, skipped=skipped)
+    return {'rows': rows, 'skipped_rows': skipped, 'seconds': elapsed, 'rows_per_second': rows / elapsed if elapsed > 0 else 0.0}
+
+def _record(done, completed, output_dir, chunk_size):
+    rows = 0
+    for future in done:
+        index, count = future.result()
+        completed.add(index)
+        rows += count
+    _save_manifest(output_dir, completed, chunk_size)
+    return rows
+
+def _report(log, rows, start, final=False, skipped=0):
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    message = f"{rows:,} rows priced in {elapsed:.1f}s ({rate:,.0f} rows/s)"
+    if final and skipped:
+        message += f", {skipped:,} rows skipped from previous run"
+    print(message, file=log, flush=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Price a CSV or Parquet file of contracts (columns S, K, T, r, sigma) with Black-Scholes")
+    parser.add_argument("input", help="Input .csv or .parquet file")
+    parser.add_argument("output", help="Output directory for Parquet part files")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--greeks", action="store_true", help="Also write delta, gamma, vega, theta and rho")
+    parser.add_argument("--float32", action="store_true", help="Write float32 results")
+    parser.add_argument("--resume", action="store_true", help="Skip chunks finished by an earlier run")
+    parser.add_argument("--overwrite", action="store_true", help="Delete results of an earlier run in the output directory first")
+    args = parser.parse_args()
+
+    price_file(args.input, args.output, args.chunk_size, args.workers, args.greeks,
+               np.float32 if args.float32 else np.float64, args.resume, args.overwrite)
@@ -0,0 +1,176 @@
+import math
+import numpy as np
+from scipy.special import ndtr
+
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+# Function to broadcast the Black-Scholes inputs to arrays of a common shape and dtype
+def _as_arrays(S, K, T, r, sigma, dtype=np.float64):
+    return np.broadcast_arrays(*(np.asarray(x, dtype=dtype) for x in (S, K, T, r, sigma)))
+
+# Function to turn 0-d results back into plain scalars so scalar callers keep scalar outputs
+def _unwrap(x):
+    return x[()] if isinstance(x, np.ndarray) and x.ndim == 0 else x
+
+# Function to compute d1, d2 and the shared intermediate terms used by prices and Greeks.
+# When sigma * sqrt(T) is zero (expiry or no volatility) the option is deterministic, so d1 and d2
+# are pushed to +/-inf depending on whether the discounted forward finishes in the money.
+def _d1_d2_terms(S, K, T, r, sigma):
+    sqrt_T = np.sqrt(T)
+    vol_sqrt_T = sigma * sqrt_T
+    drift = np.log(S / K) + r * T
+    degenerate = vol_sqrt_T <= 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = (drift + 0.5 * sigma ** 2 * T) / vol_sqrt_T
+    if degenerate.any():
+        d1 = np.where(degenerate, np.where(drift > 0, np.inf, -np.inf), d1)
+    d2 = d1 - vol_sqrt_T
+    return d1, d2, sqrt_T, vol_sqrt_T, degenerate
+
+# Function to calculate d1 and d2 for Black-Scholes formula
+def calculate_d1_d2(S, K, T, r, sigma):
+    S, K, T, r, sigma = _as_arrays(S, K, T, r, sigma)
+    d1, d2, _, _, _ = _d1_d2_terms(S, K, T, r, sigma)
+    return _unwrap(d1), _unwrap(d2)
+
+# Function to calculate Black-Scholes prices and Greeks for whole arrays of contracts in one pass.
+# Inputs broadcast against each other; theta is per year and vega/rho are per unit of sigma/r.
+def black_scholes_greeks(S, K, T, r, sigma, dtype=np.float64):
+    S, K, T, r, sigma = _as_arrays(S, K, T, r, sigma, dtype=dtype)
+    d1, d2, sqrt_T, vol_sqrt_T, degenerate = _d1_d2_terms(S, K, T, r, sigma)
+
+    discount = np.exp(-r * T)
+    K_disc = K * discount
+    N_d1, N_d2 = ndtr(d1), ndtr(d2)
+    N_md1, N_md2 = ndtr(-d1), ndtr(-d2)
+    pdf_d1 = np.exp(-0.5 * d1 * d1) * _INV_SQRT_2PI
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gamma = pdf_d1 / (S * vol_sqrt_T)
+        decay = -S * pdf_d1 * sigma / (2.0 * sqrt_T)
+    if degenerate.any():
+        gamma = np.where(degenerate, 0.0, gamma)
+        decay = np.where(degenerate, 0.0, decay)
+
+    greeks = {
+        'call': S * N_d1 - K_disc * N_d2,
+        'put': K_disc * N_md2 - S * N_md1,
+        'call_delta': N_d1,
+        'put_delta': -N_md1,
+        'gamma': gamma,
+        'vega': S * pdf_d1 * sqrt_T,
+        'call_theta': decay - r * K_disc * N_d2,
+        'put_theta': decay + r * K_disc * N_md2,
+        'call_rho': K_disc * T * N_d2,
+        'put_rho': -K_disc * T * N_md2,
+    }
+    return {name: _unwrap(np.asarray(value, dtype=dtype)) for name, value in greeks.items()}
+
+# Function to calculate Black-Scholes call and put option prices
+def black_scholes(S, K, T, r, sigma, dtype=np.float64):
+    S, K, T, r, sigma = _as_arrays(S, K, T, r, sigma, dtype=dtype)
+    d1, d2, _, _, _ = _d1_d2_terms(S, K, T, r, sigma)
+    K_disc = K * np.exp(-r * T)
+    call_price = S * ndtr(d1) - K_disc * ndtr(d2)
+    put_price = K_disc * ndtr(-d2) - S * ndtr(-d1)
+    return _unwrap(call_price.astype(dtype, copy=False)), _unwrap(put_price.astype(dtype, copy=False))
+
+# Status codes reported per quote by implied_volatility
+IV_STATUS = {
+    0: 'converged',
+    1: 'price below intrinsic value',
+    2: 'price above no-arbitrage upper bound',
+    3: 'did not converge within max_iter',
+    4: 'invalid input (non-positive S, K or T, or NaN)',
+    5: 'no time value: price within tol of intrinsic, volatility not identifiable',
+}
+
+# Function to price a subset of contracts and return the option value and vega for the Newton step
+def _price_and_vega(S, K, T, r, sigma, is_call):
+    d1, d2, sqrt_T, _, _ = _d1_d2_terms(S, K, T, r, sigma)
+    K_disc = K * np.exp(-r * T)
+    call = S * ndtr(d1) - K_disc * ndtr(d2)
+    put = K_disc * ndtr(-d2) - S * ndtr(-d1)
+    vega = S * np.exp(-0.5 * d1 * d1) * _INV_SQRT_2PI * sqrt_T
+    return np.where(is_call, call, put), vega
+
+# Function to solve Black-Scholes implied volatility for whole arrays of quotes at once.
+# Uses a Corrado-Miller starting guess, Newton steps, and bisection inside a per-quote bracket
+# whenever a Newton step leaves it; converged quotes are masked out of later iterations.
+# Returns (sigma, status) where status holds IV_STATUS codes and sigma is NaN where unsolved.
+def implied_volatility(price, S, K, T, r, is_call=True, tol=1e-8, max_iter=100, sigma_max=10.0):
+    price, S, K, T, r, tol = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (price, S, K, T, r, tol)))
+    shape = np.broadcast_shapes(price.shape, np.shape(is_call))
+    price, S, K, T, r, tol = (np.broadcast_to(x, shape) for x in (price, S, K, T, r, tol))
+    is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), shape)
+    price, S, K, T, r, tol, is_call = (np.ravel(x) for x in (price, S, K, T, r, tol, is_call))
+
+    n = price.size
+    sigma = np.full(n, np.nan)
+    status = np.full(n, 3, dtype=np.int8)
+
+    K_disc = K * np.exp(-r * T)
+    lower = np.where(is_call, np.maximum(S - K_disc, 0.0), np.maximum(K_disc - S, 0.0))
+    upper = np.where(is_call, S, K_disc)
+    with np.errstate(invalid='ignore'):
+        invalid = ~((S > 0) & (K > 0) & (T > 0) & np.isfinite(price) & np.isfinite(r))
+        below = ~invalid & (price < lower - tol)
+        above = ~invalid & (price >= upper)
+    status[invalid] = 4
+    status[below] = 1
+    status[above] = 2
+
+    # A price within tol of intrinsic value carries no usable time value: every volatility up to
+    # the point where vega becomes material reproduces it, so no single answer can be reported
+    at_intrinsic = ~(invalid | below | above) & (price <= lower + tol)
+    status[at_intrinsic] = 5
+
+    idx = np.flatnonzero(status == 3)
+    P, S_a, K_a, T_a, r_a, tol_a, call_a = (x[idx] for x in (price, S, K, T, r, tol, is_call))
+    X = K_disc[idx]
+
+    # Corrado-Miller approximation on the call-equivalent price (via put-call parity)
+    C = np.where(call_a, P, P + S_a - X)
+    half_moneyness = 0.5 * (S_a - X)
+    core = np.sqrt(np.maximum((C - half_moneyness) ** 2 - (S_a - X) ** 2 / np.pi, 0.0))
+    guess = np.sqrt(2.0 * np.pi / T_a) / (S_a + X) * (C - half_moneyness + core)
+    vol = np.clip(np.nan_to_num(guess, nan=0.2), 1e-4, sigma_max)
+
+    lo = np.zeros(idx.size)
+    hi = np.full(idx.size, sigma_max)
+    hi_price, _ = _price_and_vega(S_a, K_a, T_a, r_a, hi, call_a)
+    too_high = P > hi_price
+    status[idx[too_high]] = 2
+
+    active = np.flatnonzero(~too_high)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        s = vol[active]
+        model, vega = _price_and_vega(S_a[active], K_a[active], T_a[active], r_a[active], s, call_a[active])
+        diff = model - P[active]
+
+        done = np.abs(diff) <= tol_a[active]
+        done_idx = active[done]
+        sigma[idx[done_idx]] = s[done]
+        status[idx[done_idx]] = 0
+
+        keep = ~done
+        active, s, diff, vega = active[keep], s[keep], diff[keep], vega[keep]
+        lo_a = np.where(diff < 0, s, lo[active])
+        hi_a = np.where(diff > 0, s, hi[active])
+        lo[active], hi[active] = lo_a, hi_a
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = s - diff / vega
+        outside = ~((newton > lo_a) & (newton < hi_a))
+        vol[active] = np.where(outside, 0.5 * (lo_a + hi_a), newton)
+
+        # The bracket can collapse below the price tolerance for quotes with vanishing vega
+        collapsed = hi_a - lo_a <= 1e-12 * np.maximum(hi_a, 1.0)
+        if collapsed.any():
+            sigma[idx[active[collapsed]]] = vol[active[collapsed]]
+            status[idx[active[collapsed]]] = 0
+            active = active[~collapsed]
+
+    return _unwrap(sigma.reshape(shape)), _unwrap(status.reshape(shape))
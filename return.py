@@ -3,22 +3,9 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 import plotly.express as px
-from scipy.stats import norm
 from datetime import datetime, timedelta, date
 import requests
-
-# Function to calculate d1 and d2 for Black-Scholes formula
-def calculate_d1_d2(S, K, T, r, sigma):
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-    return d1, d2
-
-# Function to calculate Black-Scholes call and put option prices
-def black_scholes(S, K, T, r, sigma):
-    d1, d2 = calculate_d1_d2(S, K, T, r, sigma)
-    call_price = S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
-    put_price = K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
-    return call_price, put_price
+from pricing import black_scholes
 
 # Function to fetch real-time stock data
 def fetch_stock_data(ticker):
@@ -3,6 +3,9 @@ import plotly.express as px
 from utils import prepare_stock_data
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
+from model_registry import get_registry
+from instrumentation import stage
+from downsample import downsample_frame
 
 def display_stock_price_prediction():
     st.title("Stock Price Prediction")
@@ -15,13 +18,16 @@ def display_stock_price_prediction():
 
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-    model = LinearRegression()
-    model.fit(X_train, y_train)
+    registry = get_registry()
+    model = registry.get_or_fit(ticker, LinearRegression(), X_train, y_train)
     predictions = model.predict(X_test)
 
     data['Predicted'] = model.predict(data[['Lag1', 'Lag2']])
 
     st.header("Stock Price Prediction")
-    fig = px.line(data, x=data.index, y=['Close', 'Predicted'], labels={'value': 'Price'}, title=f"{ticker} Stock Price Prediction")
-    st.plotly_chart(fig, use_container_width=True)
+    with stage("chart stock price prediction"):
+        plot_data = downsample_frame(data, ['Close', 'Predicted'])
+        fig = px.line(plot_data, x=plot_data.index, y=['Close', 'Predicted'], labels={'value': 'Price'}, title=f"{ticker} Stock Price Prediction", render_mode="webgl")
+        st.plotly_chart(fig, use_container_width=True)
+    st.sidebar.caption(registry.summary())
 
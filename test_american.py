@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from american import binomial_price, crank_nicolson_price, trinomial_price
+from pricing import black_scholes_greeks
+
+S = np.array([80.0, 100.0, 120.0])
+K, T, r, sigma = 100.0, 1.0, 0.05, 0.25
+PRICERS = [(binomial_price, {'steps': 800}), (trinomial_price, {'steps': 400}), (crank_nicolson_price, {'grid_points': 600, 'time_steps': 300})]
+
+@pytest.mark.parametrize("pricer, kwargs", PRICERS)
+@pytest.mark.parametrize("option", ['call', 'put'])
+def test_european_converges_to_closed_form(pricer, kwargs, option):
+    result = pricer(S, K, T, r, sigma, option=option, american=False, **kwargs)
+    exact = black_scholes_greeks(S, K, T, r, sigma)
+    np.testing.assert_allclose(result['price'], exact[option], atol=0.02)
+    np.testing.assert_allclose(result['delta'], exact[f'{option}_delta'], atol=5e-3)
+    np.testing.assert_allclose(result['gamma'], exact['gamma'], atol=1e-3)
+    np.testing.assert_allclose(result['vega'], exact['vega'], rtol=0.02)
+    np.testing.assert_allclose(result['rho'], exact[f'{option}_rho'], rtol=0.02)
+
+@pytest.mark.parametrize("pricer, kwargs", PRICERS)
+def test_american_put_has_early_exercise_premium(pricer, kwargs):
+    american = pricer(S, K, T, r, sigma, option='put', american=True, **kwargs)
+    european = black_scholes_greeks(S, K, T, r, sigma)['put']
+    assert np.all(american['price'] > european)
+    # With no dividends an American call is never exercised early
+    call = pricer(S, K, T, r, sigma, option='call', american=True, **kwargs)
+    np.testing.assert_allclose(call['price'], black_scholes_greeks(S, K, T, r, sigma)['call'], atol=0.02)
+
+def test_too_few_steps_raise():
+    with pytest.raises(ValueError):
+        crank_nicolson_price(100.0, K, T, r, sigma, time_steps=1)
+    with pytest.raises(ValueError):
+        binomial_price(100.0, K, T, r, sigma, steps=2)
@@ -0,0 +1,89 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from data_cache import FixtureProvider, OHLCVCache
+
+# Fixture provider that records every request it serves
+class RecordingProvider(FixtureProvider):
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.calls = []
+
+    def history(self, ticker, period=None, start=None, interval="1d"):
+        self.calls.append((ticker, period, start))
+        return super().history(ticker, period=period, start=start, interval=interval)
+
+def _bars(n, end="2024-06-28", seed=0):
+    index = pd.bdate_range(end=end, periods=n, tz='America/New_York')
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.01, n)))
+    return pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close, 'Volume': 1e6}, index=index)
+
+@pytest.fixture
+def provider():
+    return RecordingProvider({ticker: _bars(600, seed=i) for i, ticker in enumerate(['AAA', 'BBB', 'CCC'])})
+
+def test_fresh_entries_are_served_from_the_store(tmp_path, provider):
+    cache = OHLCVCache(str(tmp_path), provider, ttl=3600)
+    first = cache.get_history('AAA', period='1mo')
+    second = cache.get_history('AAA', period='6mo')
+    assert len(provider.calls) == 1 and provider.calls[0][1] == '1y'
+    assert cache.stats['misses'] == 1 and cache.stats['hits'] == 1
+    pd.testing.assert_frame_equal(second.iloc[-len(first):], first)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+def test_hits_persist_the_access_time(tmp_path, provider):
+    cache = OHLCVCache(str(tmp_path), provider, ttl=3600)
+    cache.get_history('AAA')
+    cache._index['AAA_1d']['accessed_at'] = 0.0
+    cache._save_index()
+    cache.get_history('AAA')
+    with open(tmp_path / 'index.json') as f:
+        assert json.load(f)['AAA_1d']['accessed_at'] > 0.0
+    assert OHLCVCache(str(tmp_path), provider)._index == cache._index
+
+def test_longer_periods_are_refetched(tmp_path, provider):
+    cache = OHLCVCache(str(tmp_path), provider, ttl=3600)
+    cache.get_history('AAA', period='1mo')
+    history = cache.get_history('AAA', period='2y')
+    assert provider.calls[-1][1] == '2y'
+    assert history.index[0] > history.index[-1] - pd.DateOffset(years=2)
+    assert cache._index['AAA_1d']['covered'] == '2y'
+
+def test_stale_entries_are_topped_up_from_the_last_bar(tmp_path, provider):
+    full = provider.frames['AAA']
+    provider.frames['AAA'] = full.iloc[:-5].copy()
+    # The last stored bar is a partial one that the top-up must replace
+    provider.frames['AAA'].iloc[-1, provider.frames['AAA'].columns.get_loc('Close')] = -1.0
+    cache = OHLCVCache(str(tmp_path), provider, ttl=-1)
+    cache.get_history('AAA', period='1y')
+
+    provider.frames['AAA'] = full
+    history = cache.get_history('AAA', period='1y')
+    ticker, period, start = provider.calls[-1]
+    assert period is None and start == full.index[-6].date()
+    assert cache.stats['incremental'] == 1
+    pd.testing.assert_frame_equal(history, full[full.index > full.index[-1] - pd.DateOffset(years=1)], check_freq=False)
+
+def test_least_recently_used_keys_are_evicted(tmp_path, provider):
+    cache = OHLCVCache(str(tmp_path), provider, ttl=3600)
+    cache.get_history('AAA')
+    cache.get_history('BBB')
+    cache.get_history('AAA')
+    cache.max_bytes = int(max(entry['bytes'] for entry in cache._index.values()) * 2.5)
+    cache.get_history('CCC')
+    assert sorted(cache._index) == ['AAA_1d', 'CCC_1d']
+    assert not os.path.exists(cache._path('BBB_1d'))
+    assert sum(entry['bytes'] for entry in cache._index.values()) <= cache.max_bytes
+
+def test_offline_mode_serves_stored_history_only(tmp_path, provider):
+    expected = OHLCVCache(str(tmp_path), provider).get_history('AAA', period='1y')
+    calls = len(provider.calls)
+    offline = OHLCVCache(str(tmp_path), provider, ttl=-1, offline=True)
+    # Stale and shorter than requested, but nothing is downloaded
+    pd.testing.assert_frame_equal(offline.get_history('AAA', period='1y'), expected, check_freq=False)
+    assert offline.get_history('AAA', period='2y').index[0] == expected.index[0]
+    with pytest.raises(LookupError):
+        offline.get_history('BBB')
+    assert len(provider.calls) == calls
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+import data_cache
+from indicators import IndicatorEngine
+from utils import prepare_trading_data
+
+TICKERS = ['AAA', 'BBB', 'CCC']
+COLUMNS = ['Return', 'MA10', 'MA50', 'RSI', 'Signal']
+
+@pytest.fixture(autouse=True)
+def synthetic_cache(tmp_path):
+    data_cache.set_cache(data_cache.OHLCVCache(str(tmp_path), data_cache.SyntheticProvider(seed=0)))
+    yield
+    data_cache.set_cache(None)
+
+def _closes():
+    return np.column_stack([data_cache.get_cache().get_history(t, period="5y")['Close'].to_numpy() for t in TICKERS])
+
+def test_bootstrap_matches_prepare_trading_data():
+    closes = _closes()
+    result = IndicatorEngine(TICKERS).bootstrap(closes)
+    for i, ticker in enumerate(TICKERS):
+        expected = prepare_trading_data(ticker)
+        # prepare_trading_data drops the warm-up rows; the engine keeps the full history
+        rows = slice(len(closes) - len(expected), None)
+        for column in COLUMNS:
+            np.testing.assert_allclose(result[column][rows, i], expected[column].to_numpy(), rtol=0, atol=1e-10, err_msg=column)
+
+def test_update_matches_prepare_trading_data():
+    closes = _closes()
+    engine = IndicatorEngine(TICKERS)
+    engine.bootstrap(closes[:-20])
+    for bar in closes[-20:]:
+        current = engine.update(bar)
+    for i, ticker in enumerate(TICKERS):
+        expected = prepare_trading_data(ticker).iloc[-1]
+        for column in COLUMNS:
+            assert current[column][i] == pytest.approx(expected[column], abs=1e-10), column
+
+def test_update_skips_tickers_without_a_bar():
+    closes = _closes()
+    engine = IndicatorEngine(TICKERS)
+    engine.bootstrap(closes[:-1])
+    before = engine.current()
+    bar = closes[-1].copy()
+    bar[1] = np.nan
+    after = engine.update(bar)
+    for column in COLUMNS:
+        assert after[column][1] == pytest.approx(before[column][1], nan_ok=True), column
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from monte_carlo import monte_carlo_price
+from pricing import black_scholes
+
+S, K, T, r, sigma = 100.0, 105.0, 0.75, 0.03, 0.25
+
+@pytest.mark.parametrize("option", ['call', 'put'])
+@pytest.mark.parametrize("control_variate", [True, False])
+def test_european_matches_closed_form(option, control_variate):
+    result = monte_carlo_price(S, K, T, r, sigma, option=option, n_paths=200_000, control_variate=control_variate, seed=1)
+    call, put = black_scholes(S, K, T, r, sigma)
+    exact = call if option == 'call' else put
+    assert 0 < result['std_error'] < 0.05
+    assert abs(result['price'] - exact) < 4 * result['std_error']
+
+@pytest.mark.parametrize("n_paths, antithetic, expected", [(1000, False, 1000), (1001, False, 1001), (1001, True, 1002), (250_001, True, 250_002)])
+def test_n_paths_is_honoured(n_paths, antithetic, expected):
+    result = monte_carlo_price(S, K, T, r, sigma, n_paths=n_paths, chunk_size=100_000, antithetic=antithetic, seed=0)
+    assert result['n_paths'] == expected
+
+@pytest.mark.parametrize("target_error", [None, 0.02])
+def test_results_do_not_depend_on_worker_count(target_error):
+    kwargs = dict(payoff='asian', n_paths=80_000, n_steps=20, chunk_size=10_000, target_error=target_error, seed=7)
+    serial = monte_carlo_price(S, K, T, r, sigma, n_workers=1, **kwargs)
+    parallel = monte_carlo_price(S, K, T, r, sigma, n_workers=3, **kwargs)
+    assert parallel == serial
+    if target_error is not None:
+        # Stops part-way through a parallel batch of three chunks
+        assert serial['n_paths'] == 40_000 and serial['std_error'] <= target_error
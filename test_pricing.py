@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from pricing import black_scholes, black_scholes_greeks, implied_volatility
+
+def _surface(n=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    S, K = rng.uniform(50, 150, n), rng.uniform(40, 160, n)
+    T, r, sigma = rng.uniform(0.02, 2, n), rng.uniform(0, 0.06, n), rng.uniform(0.05, 1.0, n)
+    return S, K, T, r, sigma, np.arange(n) % 2 == 0
+
+def test_implied_volatility_round_trip():
+    S, K, T, r, sigma, is_call = _surface()
+    call, put = black_scholes(S, K, T, r, sigma)
+    price = np.where(is_call, call, put)
+    solved, status = implied_volatility(price, S, K, T, r, is_call)
+
+    converged = status == 0
+    assert converged.mean() > 0.9
+    # Vol is recovered wherever vega makes it identifiable; everywhere else the price is reproduced
+    vega = black_scholes_greeks(S, K, T, r, sigma)['vega']
+    identifiable = converged & (vega > 1e-2)
+    np.testing.assert_allclose(solved[identifiable], sigma[identifiable], atol=1e-6)
+    call_fit, put_fit = black_scholes(S[converged], K[converged], T[converged], r[converged], solved[converged])
+    np.testing.assert_allclose(np.where(is_call[converged], call_fit, put_fit), price[converged], atol=1e-7)
+
+def test_implied_volatility_flags_unsolvable_quotes():
+    S, K, T, r = 100.0, 100.0, 0.5, 0.03
+    call, _ = black_scholes(S, K, T, r, 0.2)
+    intrinsic = S - 40.0 * np.exp(-r * T)
+    sigma, status = implied_volatility([call, 0.0, 150.0, call, intrinsic], S, [K, K, K, -1.0, 40.0], T, r, True)
+    assert status.tolist() == [0, 1, 2, 4, 5]
+    assert sigma[0] == pytest.approx(0.2, abs=1e-8)
+    assert np.isnan(sigma[1:]).all()
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+import data_cache
+from volatility import ESTIMATORS, FIELDS, RollingVolatility, estimate_history, estimate_panel, ohlc_panel
+
+TICKERS = ['AAA', 'BBB', 'CCC']
+WINDOW = 21
+
+@pytest.fixture(autouse=True)
+def synthetic_cache(tmp_path):
+    data_cache.set_cache(data_cache.OHLCVCache(str(tmp_path), data_cache.SyntheticProvider(seed=0)))
+    yield
+    data_cache.set_cache(None)
+
+def _ohlc():
+    panel, errors = ohlc_panel(TICKERS, period="1y")
+    assert not errors
+    return [panel[field].to_numpy() for field in FIELDS]
+
+# Function to compute the full-window estimators over the last `window` bars. Return-based terms
+# need the bar before the window too, range-based ones only the window itself.
+def _reference(ohlc, window=WINDOW):
+    with_previous = [x[-window - 1:] for x in ohlc]
+    in_window = [x[-window:] for x in ohlc]
+    return {
+        'close_to_close': ESTIMATORS['close_to_close'](*with_previous),
+        'parkinson': ESTIMATORS['parkinson'](*in_window),
+        'garman_klass': ESTIMATORS['garman_klass'](*in_window),
+        'yang_zhang': ESTIMATORS['yang_zhang'](*with_previous),
+        'ewma': ESTIMATORS['ewma'](*ohlc),
+    }
+
+def _assert_matches(result, expected):
+    for name, value in expected.items():
+        np.testing.assert_allclose(result[name], value, rtol=1e-9, err_msg=name)
+
+def test_bootstrap_matches_full_window_estimators():
+    ohlc = _ohlc()
+    _assert_matches(RollingVolatility(TICKERS, window=WINDOW).bootstrap(*ohlc), _reference(ohlc))
+
+def test_update_matches_full_window_estimators():
+    ohlc = _ohlc()
+    rolling = RollingVolatility(TICKERS, window=WINDOW)
+    rolling.bootstrap(*(x[:-30] for x in ohlc))
+    for t in range(len(ohlc[0]) - 30, len(ohlc[0])):
+        current = rolling.update(*(x[t] for x in ohlc))
+    _assert_matches(current, _reference(ohlc))
+
+def test_too_short_a_history_gives_nan():
+    ohlc = _ohlc()
+    current = RollingVolatility(TICKERS, window=WINDOW).bootstrap(*(x[:WINDOW] for x in ohlc))
+    assert np.isnan(current['close_to_close']).all()
+    assert not np.isnan(current['ewma']).any()
+
+def test_estimate_panel_matches_single_histories():
+    panel, _ = ohlc_panel(TICKERS, period="1y")
+    cache = data_cache.get_cache()
+    for estimator in ESTIMATORS:
+        estimates = estimate_panel(panel, estimator)
+        assert list(estimates.index) == TICKERS
+        for ticker in TICKERS:
+            expected = estimate_history(cache.get_history(ticker, period="1y"), estimator)
+            assert estimates[ticker] == pytest.approx(expected, rel=1e-9), (estimator, ticker)
+    with pytest.raises(ValueError):
+        estimate_panel(panel, 'unknown')
+
+def test_ohlc_panel_aligns_time_zones_and_pads_short_histories():
+    index = pd.bdate_range(end="2024-12-31", periods=20, tz='Asia/Tokyo') + pd.Timedelta(hours=15)
+    frame = pd.DataFrame({field: np.linspace(1, 2, 20) for field in FIELDS + ('Volume',)}, index=index)
+    # The same date published twice: the later bar wins
+    frame = pd.concat([frame, frame.iloc[-1:] * 2])
+    data_cache.set_cache(data_cache.OHLCVCache(data_cache.get_cache().root, data_cache.FixtureProvider({'TKY': frame}), min_period='1mo'))
+    data_cache.get_cache().provider.frames['AAA'] = data_cache.SyntheticProvider(seed=0).history('AAA', period='1mo')
+
+    panel, errors = ohlc_panel(['AAA', 'TKY', 'BAD'], period="1mo")
+    assert list(errors) == ['BAD']
+    close = panel['Close']
+    assert close.index.tz is None and (close.index == close.index.normalize()).all()
+    assert close.index.is_unique and close.index.is_monotonic_increasing
+    assert close['TKY'].loc['2024-12-31'] == 4.0
+    assert close['TKY'].isna().sum() == len(close) - 20 and close['TKY'].first_valid_index() > close.index[0]
@@ -3,6 +3,10 @@ import plotly.express as px
 from utils import prepare_trading_data
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
+from model_registry import get_registry
+from instrumentation import stage
+from downsample import downsample_frame
+from backtest import walk_forward
 
 def display_trading_signal_generation():
     st.title("Trading Signal Generation")
@@ -15,12 +19,30 @@ def display_trading_signal_generation():
 
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-    model = RandomForestClassifier()
-    model.fit(X_train, y_train)
+    registry = get_registry()
+    model = registry.get_or_fit(ticker, RandomForestClassifier(n_jobs=-1), X_train, y_train)
     predictions = model.predict(X_test)
 
     data['Signal_Predicted'] = model.predict(data[['Return', 'MA10', 'MA50', 'RSI']])
 
     st.header("Trading Signal Generation")
-    fig = px.line(data, x=data.index, y=['Close', 'Signal_Predicted'], labels={'value': 'Price'}, title=f"{ticker} Trading Signal Generation")
-    st.plotly_chart(fig, use_container_width=True)
+    with stage("chart trading signals"):
+        plot_data = downsample_frame(data, ['Close', 'Signal_Predicted'])
+        fig = px.line(plot_data, x=plot_data.index, y=['Close', 'Signal_Predicted'], labels={'value': 'Price'}, title=f"{ticker} Trading Signal Generation", render_mode="webgl")
+        st.plotly_chart(fig, use_container_width=True)
+    st.sidebar.caption(registry.summary())
+
+    st.header("Walk-Forward Backtest")
+    window = st.selectbox("Training window", ["expanding", "rolling"])
+    if st.button("Run Backtest"):
+        with stage("walk-forward backtest"):
+            backtest_data, metrics = walk_forward(data, window=window)
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Total Return", f"{metrics['total_return']:.2%}")
+        col2.metric("Hit Rate", f"{metrics['hit_rate']:.2%}")
+        col3.metric("Max Drawdown", f"{metrics['max_drawdown']:.2%}")
+        col4.metric("Sharpe", f"{metrics['sharpe']:.2f}")
+        with stage("chart backtest signals"):
+            plot_data = downsample_frame(backtest_data, ['Close', 'Signal_Predicted'])
+            fig = px.line(plot_data, x=plot_data.index, y=['Close', 'Signal_Predicted'], labels={'value': 'Price'}, title=f"{ticker} Out-of-Sample Signals", render_mode="webgl")
+            st.plotly_chart(fig, use_container_width=True)
@@ -1,69 +1,58 @@
-import yfinance as yf
 import numpy as np
-import requests
-from scipy.stats import norm
-
-# Function to calculate d1 and d2 for Black-Scholes formula
-def calculate_d1_d2(S, K, T, r, sigma):
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-    return d1, d2
-
-# Function to calculate Black-Scholes call and put option prices
-def black_scholes(S, K, T, r, sigma):
-    d1, d2 = calculate_d1_d2(S, K, T, r, sigma)
-    call_price = S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
-    put_price = K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
-    return call_price, put_price
+from data_cache import get_cache
+from yield_curve import get_yield_curve
+from pricing import calculate_d1_d2, black_scholes, black_scholes_greeks
+from instrumentation import count, timed
+from volatility import estimate_history
 
 # Function to fetch real-time stock data
+@timed()
 def fetch_stock_data(ticker):
-    stock = yf.Ticker(ticker)
-    data = stock.history(period="1d")
+    data = get_cache().get_history(ticker, period="1d")
     return data['Close'].iloc[-1]
 
 # Function to fetch historical stock data
+@timed()
 def fetch_historical_data(ticker, period="1mo"):
-    stock = yf.Ticker(ticker)
-    data = stock.history(period=period)
+    data = get_cache().get_history(ticker, period=period)
     return data
 
-# Function to fetch the risk-free rate (using 1-year Treasury yield from a financial API)
-def fetch_risk_free_rate():
-    try:
-        response = requests.get("https://www.alphavantage.co/query?function=TREASURY_YIELD&interval=monthly&maturity=1year&apikey=YOUR_API_KEY")
-        data = response.json()
-        risk_free_rate = float(data['data'][-1]['value']) / 100  # Convert percentage to decimal
-    except Exception as e:
-        risk_free_rate = 0.05
-    return risk_free_rate
+# Function to fetch the risk-free rate for a time to expiration (in years), interpolated on the
+# cached Treasury yield curve; T may be an array of expiries
+@timed()
+def fetch_risk_free_rate(T=1.0):
+    return get_yield_curve().rate(T)
+
+# Function to calculate the volatility of the stock with one of the estimators in volatility.ESTIMATORS
+@timed()
+def calculate_volatility(ticker, estimator='close_to_close'):
+    hist = get_cache().get_history(ticker, period="1y")
+    return volatility_from_history(hist, estimator)
 
-# Function to calculate the volatility of the stock
-def calculate_volatility(ticker):
-    stock = yf.Ticker(ticker)
-    hist = stock.history(period="1y")
-    hist['returns'] = hist['Close'].pct_change()
-    volatility = hist['returns'].std() * np.sqrt(252)
-    return volatility
+# Function to calculate annualized volatility from an already fetched history
+def volatility_from_history(hist, estimator='close_to_close'):
+    return estimate_history(hist, estimator)
 
 # Function to prepare data for stock price prediction
+@timed()
 def prepare_stock_data(ticker):
-    stock = yf.Ticker(ticker)
-    data = stock.history(period="5y")
+    data = get_cache().get_history(ticker, period="5y")
     data['Return'] = data['Close'].pct_change()
     data['Lag1'] = data['Return'].shift(1)
     data['Lag2'] = data['Return'].shift(2)
     data.dropna(inplace=True)
+    count('rows_processed', len(data))
     return data
 
 # Function to prepare data for trading signal generation
+@timed()
 def prepare_trading_data(ticker):
-    stock = yf.Ticker(ticker)
-    data = stock.history(period="5y")
+    data = get_cache().get_history(ticker, period="5y")
     data['Return'] = data['Close'].pct_change()
     data['MA10'] = data['Close'].rolling(window=10).mean()
     data['MA50'] = data['Close'].rolling(window=50).mean()
     data['RSI'] = (data['Close'].diff(1) > 0).rolling(window=14).sum() / 14 * 100
     data['Signal'] = np.where(data['MA10'] > data['MA50'], 1, 0)
     data.dropna(inplace=True)
+    count('rows_processed', len(data))
     return data
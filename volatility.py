@@ -0,0 +1,214 @@
+import numpy as np
+import pandas as pd
+from indicators import _RollingSum
+
+TRADING_DAYS = 252
+FIELDS = ('Open', 'High', 'Low', 'Close')
+
+# Function to compute the per-bar terms every estimator is built from, as (bars x tickers) arrays:
+# simple and log close-to-close returns, squared log high/low range, the Garman-Klass term, the
+# overnight (open vs previous close) and open-to-close log returns and the Rogers-Satchell term.
+# The first bar has no previous close, so its return terms are NaN.
+def _terms(open_, high, low, close):
+    open_, high, low, close = (np.asarray(x, dtype=float).reshape(len(x), -1) for x in (open_, high, low, close))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_hl = np.log(high / low)
+        log_co = np.log(close / open_)
+        previous = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+        return {
+            'simple': close / previous - 1,
+            'log': np.log(close / previous),
+            'hl2': log_hl ** 2,
+            'gk': 0.5 * log_hl ** 2 - (2 * np.log(2) - 1) * log_co ** 2,
+            'overnight': np.log(open_ / previous),
+            'open_close': log_co,
+            'rs': np.log(high / close) * np.log(high / open_) + np.log(low / close) * np.log(low / open_),
+        }
+
+def _annualize(variance):
+    return np.sqrt(np.maximum(variance, 0.0) * TRADING_DAYS)
+
+# Function to weight Yang-Zhang's open-to-close variance for a sample of n bars
+def _yang_zhang_k(n):
+    n = np.asarray(n, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 0.34 / (1.34 + (n + 1) / (n - 1))
+
+# Function to calculate annualized close-to-close volatility: the standard deviation of simple
+# daily returns, matching what calculate_volatility has always reported
+def close_to_close(open_, high, low, close):
+    return _annualize(np.nanvar(_terms(open_, high, low, close)['simple'], axis=0, ddof=1))
+
+# Function to calculate RiskMetrics-style EWMA volatility of log returns with decay lam, normalized by
+# the sum of the weights so short histories are not biased low
+def ewma(open_, high, low, close, lam=0.94):
+    returns = _terms(open_, high, low, close)['log']
+    valid = ~np.isnan(returns)
+    weights = lam ** np.arange(len(returns) - 1, -1, -1, dtype=float)[:, None] * valid
+    with np.errstate(invalid='ignore'):
+        return _annualize((weights * np.where(valid, returns, 0.0) ** 2).sum(axis=0) / weights.sum(axis=0))
+
+# Function to calculate Parkinson high/low range volatility
+def parkinson(open_, high, low, close):
+    return _annualize(np.nanmean(_terms(open_, high, low, close)['hl2'], axis=0) / (4 * np.log(2)))
+
+# Function to calculate Garman-Klass OHLC volatility
+def garman_klass(open_, high, low, close):
+    return _annualize(np.nanmean(_terms(open_, high, low, close)['gk'], axis=0))
+
+# Function to calculate Yang-Zhang volatility: overnight variance plus a weighted mix of open-to-close
+# and Rogers-Satchell variance, robust to both opening jumps and drift
+def yang_zhang(open_, high, low, close):
+    terms = _terms(open_, high, low, close)
+    overnight, open_close = terms['overnight'], terms['open_close']
+    # Only bars with a previous close enter all three components, so they share one sample
+    open_close = np.where(np.isnan(overnight), np.nan, open_close)
+    rs = np.where(np.isnan(overnight), np.nan, terms['rs'])
+    k = _yang_zhang_k(np.sum(~np.isnan(overnight), axis=0))
+    variance = np.nanvar(overnight, axis=0, ddof=1) + k * np.nanvar(open_close, axis=0, ddof=1) + (1 - k) * np.nanmean(rs, axis=0)
+    return _annualize(variance)
+
+# Function to fit GARCH(1,1) to the demeaned log returns of every ticker at once by maximizing the
+# Gaussian likelihood over an (alpha, beta) grid with variance targeting (omega = v * (1 - alpha - beta)).
+# The variance recursion runs over time with all grid points and tickers updated in one array step.
+# Returns omega, alpha, beta and the annualized next-day and long-run volatility per ticker.
+def garch11(open_, high, low, close, alphas=np.linspace(0.02, 0.30, 15), betas=np.linspace(0.50, 0.98, 25)):
+    returns = _terms(open_, high, low, close)['log']
+    valid = ~np.isnan(returns)
+    returns = np.where(valid, returns - np.nanmean(returns, axis=0), 0.0)
+    sample_var = (returns ** 2).sum(axis=0) / np.maximum(valid.sum(axis=0) - 1, 1)
+
+    alpha, beta = (x.ravel() for x in np.meshgrid(alphas, betas))
+    keep = alpha + beta < 0.999
+    alpha, beta = alpha[keep, None], beta[keep, None]
+    omega = sample_var * (1 - alpha - beta)
+    variance = np.broadcast_to(sample_var, omega.shape).copy()
+    loglik = np.zeros(omega.shape)
+    for t in range(len(returns)):
+        r2 = returns[t] ** 2
+        step = valid[t]
+        loglik -= step * 0.5 * (np.log(variance) + r2 / variance)
+        variance = np.where(step, omega + alpha * r2 + beta * variance, variance)
+
+    best = np.argmax(loglik, axis=0)
+    columns = np.arange(returns.shape[1])
+    a, b, w = alpha[best, 0], beta[best, 0], omega[best, columns]
+    return {
+        'omega': w,
+        'alpha': a,
+        'beta': b,
+        'volatility': _annualize(variance[best, columns]),
+        'long_run_volatility': _annualize(w / (1 - a - b)),
+    }
+
+ESTIMATORS = {
+    'close_to_close': close_to_close,
+    'ewma': ewma,
+    'parkinson': parkinson,
+    'garman_klass': garman_klass,
+    'yang_zhang': yang_zhang,
+    'garch': lambda *ohlc: garch11(*ohlc)['volatility'],
+}
+
+# Function to download an aligned OHLC panel (field -> dates x tickers DataFrame) in one bulk fetch.
+# Tickers with a shorter history are padded with leading NaNs. Returns (panel, errors).
+def ohlc_panel(tickers, period="1y", **kwargs):
+    from market_data import fetch_daily_histories  # Deferred: market_data imports utils, which imports this module
+
+    histories, errors = fetch_daily_histories(tickers, period=period, **kwargs)
+    panel = {field: pd.DataFrame({t: history[field] for t, history in histories.items()}).sort_index() for field in FIELDS}
+    return panel, errors
+
+# Function to run one estimator over an OHLC panel; returns annualized volatility per ticker
+def estimate_panel(panel, estimator='close_to_close'):
+    if estimator not in ESTIMATORS:
+        raise ValueError(f"Unknown volatility estimator {estimator!r}; expected one of {tuple(ESTIMATORS)}")
+    close = panel['Close']
+    return pd.Series(ESTIMATORS[estimator](*(panel[field].to_numpy() for field in FIELDS)), index=close.columns, name=estimator)
+
+# Function to run one estimator on a single ticker's history; returns annualized volatility
+def estimate_history(history, estimator='close_to_close'):
+    if estimator not in ESTIMATORS:
+        raise ValueError(f"Unknown volatility estimator {estimator!r}; expected one of {tuple(ESTIMATORS)}")
+    return float(ESTIMATORS[estimator](*(history[field].to_numpy() for field in FIELDS))[0])
+
+# Incremental rolling volatility over the last `window` bars for a fixed universe of tickers:
+# close-to-close, Parkinson, Garman-Klass and Yang-Zhang from running sums, and EWMA from its
+# recursion. Each new bar costs O(1) per ticker; state can be bootstrapped in bulk from (bars x tickers)
+# OHLC arrays, with leading NaNs for tickers that have a shorter history.
+class RollingVolatility:
+    _SUMS = ('simple', 'simple2', 'hl2', 'gk', 'overnight', 'overnight2', 'open_close', 'open_close2', 'rs')
+
+    def __init__(self, tickers, window=21, lam=0.94):
+        self.tickers = list(tickers)
+        n = len(self.tickers)
+        self.window = window
+        self.lam = lam
+        self.last_close = np.full(n, np.nan)
+        self.count = np.zeros(n, dtype=np.int64)
+        self._sums = {name: _RollingSum(n, window) for name in self._SUMS}
+        self._ewma_sum = np.zeros(n)
+        self._ewma_weight = np.zeros(n)
+
+    @staticmethod
+    def _values(terms):
+        return {
+            'simple': terms['simple'], 'simple2': terms['simple'] ** 2,
+            'hl2': terms['hl2'], 'gk': terms['gk'],
+            'overnight': terms['overnight'], 'overnight2': terms['overnight'] ** 2,
+            'open_close': terms['open_close'], 'open_close2': terms['open_close'] ** 2,
+            'rs': terms['rs'],
+        }
+
+    # Function to load the rolling state from full OHLC histories and return the current estimates
+    def bootstrap(self, open_, high, low, close):
+        close = np.asarray(close, dtype=float).reshape(len(close), -1)
+        terms = _terms(open_, high, low, close)
+        valid = ~np.isnan(terms['simple'])
+        for name, values in self._values(terms).items():
+            self._sums[name].load(np.where(valid, values, np.nan))
+        weights = self.lam ** np.arange(len(close) - 1, -1, -1, dtype=float)[:, None] * valid
+        self._ewma_sum = (weights * np.where(valid, terms['log'], 0.0) ** 2).sum(axis=0)
+        self._ewma_weight = weights.sum(axis=0)
+        self.count = valid.sum(axis=0)
+        last = np.flatnonzero(~np.isnan(close).all(axis=1))
+        self.last_close = close[last[-1]].copy() if last.size else np.full(close.shape[1], np.nan)
+        return self.current()
+
+    # Function to apply one new bar per ticker; NaN in close means that ticker has no new bar
+    def update(self, open_, high, low, close):
+        open_, high, low, close = (np.asarray(x, dtype=float) for x in (open_, high, low, close))
+        has_bar = ~np.isnan(close)
+        # A two-row panel whose first row is the stored closes gives the new bar's terms
+        terms = _terms(*(np.vstack([self.last_close, x]) for x in (open_, high, low, close)))
+        terms = {name: values[1] for name, values in terms.items()}
+        rows = np.flatnonzero(has_bar & ~np.isnan(terms['simple']))
+        for name, values in self._values(terms).items():
+            self._sums[name].push(rows, values[rows])
+        self._ewma_sum[rows] = self.lam * self._ewma_sum[rows] + terms['log'][rows] ** 2
+        self._ewma_weight[rows] = self.lam * self._ewma_weight[rows] + 1
+        # Tickers without a bar still age by one step in the EWMA, like a bootstrap with a NaN bar
+        idle = np.flatnonzero(~has_bar)
+        self._ewma_sum[idle] *= self.lam
+        self._ewma_weight[idle] *= self.lam
+        self.count[rows] += 1
+        self.last_close[has_bar] = close[has_bar]
+        return self.current()
+
+    # Function to return the latest rolling estimates per ticker, NaN until a full window is available
+    def current(self):
+        n = float(self.window)
+        s = {name: rolling.sum for name, rolling in self._sums.items()}
+        full = self.count >= self.window
+        sample_var = lambda total, squares: (squares - total * total / n) / (n - 1)
+        k = _yang_zhang_k(n)
+        estimates = {
+            'close_to_close': _annualize(sample_var(s['simple'], s['simple2'])),
+            'parkinson': _annualize(s['hl2'] / n / (4 * np.log(2))),
+            'garman_klass': _annualize(s['gk'] / n),
+            'yang_zhang': _annualize(sample_var(s['overnight'], s['overnight2']) + k * sample_var(s['open_close'], s['open_close2']) + (1 - k) * s['rs'] / n),
+        }
+        result = {name: np.where(full, value, np.nan) for name, value in estimates.items()}
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result['ewma'] = np.where(self._ewma_weight > 0, _annualize(self._ewma_sum / self._ewma_weight), np.nan)
+        return result
@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# Treasury maturities published by the Alpha Vantage TREASURY_YIELD endpoint, in years
+MATURITIES = {'3month': 0.25, '2year': 2.0, '5year': 5.0, '7year': 7.0, '10year': 10.0, '30year': 30.0}
+
+# Curve source loading the latest monthly Treasury yields from Alpha Vantage
+class AlphaVantageSource:
+    URL = "https://www.alphavantage.co/query"
+
+    def __init__(self, api_key=None, maturities=MATURITIES, timeout=5.0):
+        self.api_key = api_key or os.environ.get('ALPHAVANTAGE_API_KEY', 'YOUR_API_KEY')
+        self.maturities = maturities
+        self.timeout = timeout
+
+    def _load_one(self, maturity):
+        import requests  # Deferred: only needed when the curve is actually refreshed
+
+        params = {'function': 'TREASURY_YIELD', 'interval': 'monthly', 'maturity': maturity, 'apikey': self.api_key}
+        response = requests.get(self.URL, params=params, timeout=self.timeout)
+        data = response.json()
+        return float(data['data'][0]['value']) / 100  # Latest observation first; percentage to decimal
+
+    def load(self):
+        points = {}
+        with ThreadPoolExecutor(max_workers=len(self.maturities)) as executor:
+            futures = {years: executor.submit(self._load_one, name) for name, years in self.maturities.items()}
+        for years, future in futures.items():
+            try:
+                points[years] = future.result()
+            except Exception:
+                continue
+        if not points:
+            raise ValueError("No Treasury yields could be loaded")
+        return points
+
+# Curve source reading {maturity_in_years: rate} from a JSON file, or a two-column CSV of maturity,rate
+class FileSource:
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        if self.path.endswith('.json'):
+            with open(self.path) as f:
+                return {float(t): float(rate) for t, rate in json.load(f).items()}
+        data = np.loadtxt(self.path, delimiter=',', skiprows=1, ndmin=2)
+        return dict(zip(data[:, 0], data[:, 1]))
+
+# Curve source returning fixed points, for tests and offline use
+class StaticSource:
+    def __init__(self, points):
+        self.points = dict(points)
+
+    def load(self):
+        return dict(self.points)
+
+# Zero-rate curve loaded once from a pluggable source and cached for ttl seconds. After the first
+# load, stale curves keep serving while a background thread refreshes them, so a slow endpoint
+# never blocks a page render for longer than load_timeout.
+class YieldCurve:
+    def __init__(self, source, ttl=3600, method='linear', fallback_rate=0.05, load_timeout=3.0, retry_after=60):
+        self.source = source
+        self.ttl = ttl
+        self.method = method
+        self.fallback_rate = fallback_rate
+        self.load_timeout = load_timeout
+        self.retry_after = retry_after
+        self.error = None
+        self._maturities = None
+        self._rates = None
+        self._spline = None
+        self._loaded_at = None
+        self._attempted_at = None
+        self._refresh_thread = None
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        self._attempted_at = time.time()
+        try:
+            points = self.source.load()
+        except Exception as e:
+            self.error = e
+            return
+        maturities = np.array(sorted(points), dtype=float)
+        rates = np.array([points[t] for t in sorted(points)], dtype=float)
+        spline = None
+        if self.method == 'cubic' and maturities.size > 2:
+            from scipy.interpolate import CubicSpline
+            spline = CubicSpline(maturities, rates, bc_type='natural')
+        with self._lock:
+            self._maturities, self._rates, self._spline = maturities, rates, spline
+            self._loaded_at = time.time()
+            self.error = None
+
+    def _start_refresh(self):
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return self._refresh_thread
+            self._refresh_thread = threading.Thread(target=self._refresh, daemon=True)
+            self._refresh_thread.start()
+            return self._refresh_thread
+
+    # Function to return the curve points, loading them on first use and refreshing them when stale;
+    # failed loads are retried in the background at most every retry_after seconds
+    def points(self):
+        if self._attempted_at is None:
+            self._start_refresh().join(self.load_timeout)
+        elif self._loaded_at is not None and time.time() - self._loaded_at > self.ttl:
+            self._start_refresh()
+        elif self._loaded_at is None and time.time() - self._attempted_at > self.retry_after:
+            self._start_refresh()
+        with self._lock:
+            return self._maturities, self._rates, self._spline
+
+    # Whether a curve has been loaded; until then rate() returns fallback_rate
+    @property
+    def loaded(self):
+        return self._loaded_at is not None
+
+    # Function to interpolate the zero rate for one or many times to expiration (in years),
+    # holding the curve flat beyond its first and last maturities
+    def rate(self, T):
+        maturities, rates, spline = self.points()
+        T = np.asarray(T, dtype=float)
+        if maturities is None:
+            result = np.full(T.shape, self.fallback_rate)
+        elif self.method == 'cubic' and spline is not None:
+            result = spline(np.clip(T, maturities[0], maturities[-1]))
+        else:
+            result = np.interp(T, maturities, rates)
+        return result[()] if result.ndim == 0 else result
+
+_default_curve = None
+
+# Function to return the process-wide yield curve, read from BSM_YIELD_CURVE_FILE when set
+def get_yield_curve():
+    global _default_curve
+    if _default_curve is None:
+        path = os.environ.get('BSM_YIELD_CURVE_FILE')
+        _default_curve = YieldCurve(FileSource(path) if path else AlphaVantageSource())
+    return _default_curve
+
+# Function to replace the process-wide yield curve, e.g. with one backed by a StaticSource
+def set_yield_curve(curve):
+    global _default_curve
+    _default_curve = curve